@@ -8,9 +8,12 @@ with advanced animations, realistic system monitoring, and multiple themes.
 import sys
 import time
 import random
+import math
 import threading
 import json
 import logging
+import logging.handlers
+import queue
 import asyncio
 import os
 import subprocess
@@ -18,6 +21,27 @@ import psutil
 import socket
 import hashlib
 import base64
+import re
+import select
+import selectors
+import struct
+import bisect
+import mmap
+import functools
+import inspect
+import itertools
+import weakref
+import contextvars
+import http.server
+import shutil
+import gzip
+import lzma
+import unicodedata
+import cProfile
+import pstats
+import tracemalloc
+from collections import deque, OrderedDict, Counter
+from array import array
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
 import argparse
@@ -25,13 +49,14 @@ import platform
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import signal
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 
 # Third-party imports (install with pip if needed)
 try:
     from colorama import init, Fore, Back, Style
+    from colorama.ansitowin32 import AnsiToWin32, StreamWrapper
     import requests
     from rich.console import Console
     from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
@@ -41,12 +66,26 @@ try:
     from rich.live import Live
     from rich.align import Align
     from rich.text import Text
+    from rich.ansi import AnsiDecoder
     from rich.layout import Layout
 except ImportError as e:
     print(f"Missing required package: {e}")
     print("Install with: pip install colorama requests rich psutil")
     sys.exit(1)
 
+# Optional acceleration
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Terminal output queue inspection (POSIX only)
+try:
+    import fcntl
+    import termios
+except ImportError:
+    fcntl = termios = None
+
 init(autoreset=True)
 
 class SystemState(Enum):
@@ -192,19 +231,2417 @@ THEMES = {
     }
 }
 
-# Advanced animation patterns
-ANIMATION_PATTERNS = {
-    'dna': ["⠋", "⠙", "⠸", "⠴", "⠦", "⠇", "⠏", "⠋"],
-    'snake': ["⣾", "⣽", "⣻", "⢿", "⡿", "⣟", "⣯", "⣷"],
-    'circle': ["◐", "◓", "◑", "◒"],
-    'arrow': ["←", "↖", "↑", "↗", "→", "↘", "↓", "↙"],
-    'box': ["▖", "▘", "▝", "▗"],
-    'triangle': ["▲", "◢", "▼", "◤"],
-    'binary': ["0", "1"],
-    'neural': ["🧠", "⚡", "💭", "🔬"],
-    'matrix_chars': list("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@#$%^&*()_+-=[]{}|;:,./<>?"),
+class ThemeColor(str):
+    """Escape code that remembers which theme key it came from"""
+
+    def __new__(cls, code: str, key: str):
+        color = super().__new__(cls, code)
+        color.key = key
+        return color
+
+THEMES = {name: {key: ThemeColor(code, key) for key, code in theme.items()}
+          for name, theme in THEMES.items()}
+
+# Advanced animation patterns
+ANIMATION_PATTERNS = {
+    'dna': ["⠋", "⠙", "⠸", "⠴", "⠦", "⠇", "⠏", "⠋"],
+    'snake': ["⣾", "⣽", "⣻", "⢿", "⡿", "⣟", "⣯", "⣷"],
+    'circle': ["◐", "◓", "◑", "◒"],
+    'arrow': ["←", "↖", "↑", "↗", "→", "↘", "↓", "↙"],
+    'box': ["▖", "▘", "▝", "▗"],
+    'triangle': ["▲", "◢", "▼", "◤"],
+    'binary': ["0", "1"],
+    'neural': ["🧠", "⚡", "💭", "🔬"],
+    'matrix_chars': list("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@#$%^&*()_+-=[]{}|;:,./<>?"),
+}
+
+GLITCH_CHARS = "░▒▓█▄▀▐▌"
+
+PRIORITY_SYMBOLS = {
+    Priority.LOW: "▫",
+    Priority.NORMAL: "▪",
+    Priority.HIGH: "◆",
+    Priority.CRITICAL: "◼"
+}
+
+THOUGHT_PREFIXES = [
+    "[NEURAL_TRACE]", 
+    "[COGNITIVE_PROC]", 
+    "[EMERGENT_THOUGHT]",
+    "[DEEP_ANALYSIS]",
+    "[CONSCIOUSNESS]"
+]
+
+class LineFormatter:
+    """Cached formatting for the per-line hot path.
+
+    The date and time are formatted once per second and only the
+    milliseconds are filled in per line; priority symbols and the
+    thought colours of each theme are ready-made strings.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.priority_prefixes = {priority: f" {symbol} " for priority, symbol in PRIORITY_SYMBOLS.items()}
+        self._second = (None, "")  # (second, formatted prefix), swapped as one
+        self._thought_colors: Dict[int, List[str]] = {}
+
+    def timestamp(self) -> str:
+        """[YYYY-mm-dd HH:MM:SS.mmm] for the clock's current time"""
+        # Split like datetime.fromtimestamp() so the digits match exactly
+        frac, second = math.modf(self.clock.time())
+        second, micros = int(second), round(frac * 1e6)
+        if micros >= 1000000:
+            second, micros = second + 1, micros - 1000000
+        cached_second, prefix = self._second
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second).strftime('[%Y-%m-%d %H:%M:%S.')
+            self._second = (second, prefix)
+        return f"{prefix}{micros // 1000:03d}]"
+
+    def line(self, priority: Priority, prefix: str, msg: str) -> str:
+        """Timestamped log line with its priority symbol"""
+        return f"{self.timestamp()}{self.priority_prefixes.get(priority, ' ▪ ')}{prefix}: {msg}"
+
+    def thought_colors(self, theme: Dict[str, str]) -> List[str]:
+        """Colours for thought intensities 1, 2 and 3+ under a theme"""
+        colors = self._thought_colors.get(id(theme))
+        if colors is None:
+            colors = [theme['thought'], ThemeColor(Fore.LIGHTYELLOW_EX, 'thought'),
+                      ThemeColor(Fore.WHITE + Style.BRIGHT, 'thought')]
+            self._thought_colors[id(theme)] = colors
+        return colors
+
+PROGRESS_STYLES = {
+    'blocks': ('█', '░'),
+    'arrows': ('>', '-'),
+    'dots': ('●', '○'),
+    'pipes': ('|', ' '),
+    'equals': ('=', ' ')
+}
+
+class GlitchGenerator:
+    """Seedable source of glitch masks and random glyph runs, generated in bulk"""
+
+    def __init__(self, seed: Optional[int] = None, use_numpy: bool = True):
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed) if np is not None and use_numpy else None
+        self._glyph_codes = None
+        if self.np_rng is not None:
+            self._glyph_codes = np.array([ord(c) for c in GLITCH_CHARS], dtype=np.uint32)
+
+    def frames(self, text: str, passes: int, probability: float) -> List[str]:
+        """Corrupted copies of text, one per pass, each character replaced with the given probability"""
+        if not text or passes <= 0:
+            return [text] * max(passes, 0)
+        if self.np_rng is not None:
+            return self._frames_numpy(text, passes, probability)
+        return [self._corrupt(text, probability) for _ in range(passes)]
+
+    def choices(self, pattern: List[str], k: int) -> List[str]:
+        """k glyphs drawn from pattern in a single call"""
+        return self.rng.choices(pattern, k=k)
+
+    def _corrupt(self, text: str, probability: float) -> str:
+        # Jump between corrupted positions with geometric gaps, so only the
+        # replaced characters cost a draw instead of every character in text
+        n = len(text)
+        if probability >= 1:
+            positions = range(n)
+        elif probability <= 0:
+            return text
+        else:
+            log_q = math.log(1.0 - probability)
+            positions = []
+            pos = int(math.log(1.0 - self.rng.random()) / log_q)
+            while pos < n:
+                positions.append(pos)
+                pos += 1 + int(math.log(1.0 - self.rng.random()) / log_q)
+        if not positions:
+            return text
+        chars = list(text)
+        for pos, glyph in zip(positions, self.rng.choices(GLITCH_CHARS, k=len(positions))):
+            chars[pos] = glyph
+        return "".join(chars)
+
+    def _frames_numpy(self, text: str, passes: int, probability: float) -> List[str]:
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        frames = np.tile(codes, (passes, 1))
+        mask = self.np_rng.random(frames.shape) < probability
+        frames[mask] = self._glyph_codes[self.np_rng.integers(0, len(GLITCH_CHARS), int(mask.sum()))]
+        return [row.tobytes().decode('utf-32-le') for row in frames]
+
+class RealClock:
+    """Wall-clock time source; sleeps actually block"""
+    virtual = False
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def sleep(self, seconds: float, interrupter: "Interrupter" = None):
+        if seconds > 0:
+            if interrupter is None:
+                time.sleep(seconds)
+            else:
+                interrupter.wait(seconds)
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.new_event_loop()
+
+class VirtualClock:
+    """Simulated time source; sleeps advance the clock instantly"""
+    virtual = True
+
+    def __init__(self, start: Optional[float] = None):
+        self._start = time.time() if start is None else start
+        self._elapsed = 0.0
+
+    def time(self) -> float:
+        return self._start + self._elapsed
+
+    def monotonic(self) -> float:
+        return self._elapsed
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time())
+
+    def sleep(self, seconds: float, interrupter: "Interrupter" = None):
+        if seconds > 0:
+            self._elapsed += seconds
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        return VirtualTimeEventLoop(self)
+
+class Interrupted(KeyboardInterrupt):
+    """Raised from activity waits once a shutdown has been requested"""
+
+class Interrupter:
+    """Cuts short every pending wait when a shutdown is requested.
+
+    trigger() only sets a flag, writes a byte to a socket pair and schedules
+    a loop callback, so it is safe to call from a signal handler or any
+    thread. Blocking waits select() on the other end of the socket pair;
+    asyncio waits are futures that the callback resolves.
+    """
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+        self.triggered = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: set = set()
+
+    def trigger(self):
+        self.triggered = True
+        try:
+            self._writer.send(b"\0")
+        except OSError:
+            pass  # Buffer full: waiters are already awake
+        loop = self.loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wake_all)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    def reset(self):
+        self.triggered = False
+        try:
+            while self._reader.recv(256):
+                pass
+        except OSError:
+            pass
+
+    def wait(self, seconds: float) -> bool:
+        """Block for up to ``seconds``; True if triggered"""
+        if not self.triggered and seconds > 0:
+            select.select([self._reader], [], [], seconds)
+        return self.triggered
+
+    async def sleep(self, seconds: float) -> bool:
+        """asyncio.sleep() that returns early when triggered"""
+        if not self.triggered and seconds > 0:
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            handle = loop.call_later(seconds, self._wake, waiter)
+            self._waiters.add(waiter)
+            try:
+                await waiter
+            finally:
+                handle.cancel()
+                self._waiters.discard(waiter)
+        return self.triggered
+
+    @staticmethod
+    def _wake(waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def _wake_all(self):
+        for waiter in list(self._waiters):
+            self._wake(waiter)
+
+SGR_PATTERN = re.compile(r'\x1b\[([0-9;]*)m')
+
+# SGR attributes and the code that clears each of them
+SGR_ATTRIBUTE_RESETS = {
+    '1': '22', '2': '22', '3': '23', '4': '24',
+    '5': '25', '7': '27', '8': '28', '9': '29',
+}
+
+class AnsiMinimizer:
+    """Tracks SGR state and only emits escape codes when the style changes.
+
+    Effects wrap every character as ``color + char + RESET_ALL``; the
+    minimizer folds those into the logical style and writes a single
+    combined SGR sequence right before the next character that needs it.
+    """
+
+    DEFAULT = (None, None, frozenset())
+
+    def __init__(self):
+        self._current = self.DEFAULT  # what the terminal shows (None = unknown)
+        self._pending = self.DEFAULT  # what the next character should use
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+    def process(self, data: str) -> str:
+        """Rewrite a chunk of output with redundant SGR codes removed"""
+        out: List[str] = []
+        pos = 0
+        for match in SGR_PATTERN.finditer(data):
+            if match.start() > pos:
+                self._sync(out)
+                out.append(data[pos:match.start()])
+            self._apply(match.group(1), match.group(0), out)
+            pos = match.end()
+        if pos < len(data):
+            self._sync(out)
+            out.append(data[pos:])
+        result = "".join(out)
+        self.bytes_in += len(data)
+        self.bytes_out += len(result)
+        return result
+
+    def end_frame(self) -> str:
+        """Return the terminal to default attributes at a frame boundary"""
+        if self._current == self.DEFAULT:
+            return ""
+        self._current = self.DEFAULT
+        self.bytes_out += len(Style.RESET_ALL)
+        return Style.RESET_ALL
+
+    def _apply(self, params: str, raw: str, out: List[str]):
+        fg, bg, attrs = self._pending
+        attrs = set(attrs)
+        codes = params.split(';') if params else ['0']
+        i = 0
+        while i < len(codes):
+            code = codes[i] or '0'
+            num = int(code)
+            if num == 0:
+                fg, bg, attrs = None, None, set()
+            elif 30 <= num <= 37 or 90 <= num <= 97:
+                fg = code
+            elif 40 <= num <= 47 or 100 <= num <= 107:
+                bg = code
+            elif num == 39:
+                fg = None
+            elif num == 49:
+                bg = None
+            elif num in (38, 48) and len(codes) > i + 2 and codes[i + 1] in ('5', '2'):
+                width = 3 if codes[i + 1] == '5' else 5
+                value = ';'.join(codes[i:i + width])
+                if num == 38:
+                    fg = value
+                else:
+                    bg = value
+                i += width - 1
+            elif code in SGR_ATTRIBUTE_RESETS:
+                attrs.add(code)
+            elif code in SGR_ATTRIBUTE_RESETS.values():
+                attrs = {a for a in attrs if SGR_ATTRIBUTE_RESETS[a] != code}
+            else:
+                # Unknown code: pass it through and stop trusting our model
+                self._sync(out)
+                out.append(raw)
+                self._current = None
+                return
+            i += 1
+        self._pending = (fg, bg, frozenset(attrs))
+
+    def _sync(self, out: List[str]):
+        if self._pending == self._current:
+            return
+        fg, bg, attrs = self._pending
+        if self._current is None:
+            removed = True
+        else:
+            cur_fg, cur_bg, cur_attrs = self._current
+            removed = ((cur_fg and not fg) or (cur_bg and not bg)
+                       or not cur_attrs <= attrs)
+        params = ['0'] if removed else []
+        if fg and (removed or fg != cur_fg):
+            params.append(fg)
+        if bg and (removed or bg != cur_bg):
+            params.append(bg)
+        params.extend(sorted(attrs if removed else attrs - cur_attrs))
+        out.append(f"\x1b[{';'.join(params)}m")
+        self._current = self._pending
+
+class _VirtualTimeSelector(selectors.BaseSelector):
+    """Selector that advances a VirtualClock instead of blocking until timers"""
+
+    def __init__(self, clock):
+        self._clock = clock
+        self._selector = selectors.DefaultSelector()
+
+    def register(self, fileobj, events, data=None):
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self._selector.unregister(fileobj)
+
+    def select(self, timeout=None):
+        if timeout is None:
+            return self._selector.select(None)
+        ready = self._selector.select(0)
+        if not ready and timeout > 0:
+            self._clock.sleep(timeout)
+        return ready
+
+    def get_map(self):
+        return self._selector.get_map()
+
+    def close(self):
+        self._selector.close()
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose timers run on a VirtualClock"""
+
+    def __init__(self, clock):
+        super().__init__(_VirtualTimeSelector(clock))
+        self._virtual_clock = clock
+
+    def time(self) -> float:
+        return self._virtual_clock.monotonic()
+
+class FrameCache:
+    """LRU cache of precomputed animation frame strings"""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._frames: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, effect: str, text: str, theme: tuple, width: int, build) -> List[str]:
+        """Frames for (effect, text, theme, width), built on first use"""
+        key = (effect, text, theme, width)
+        frames = self._frames.get(key)
+        if frames is not None:
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return frames
+        
+        self.misses += 1
+        frames = build()
+        self._frames[key] = frames
+        if len(self._frames) > self.maxsize:
+            self._frames.popitem(last=False)
+        return frames
+
+class TerminalWriter:
+    """Buffered stdout shared by the frame renderer and the rich Console.
+
+    Raw effect frames and rich renders (Live, Progress, print) both go
+    through this one file object, so they reach the terminal in order and
+    each lands as a single write on flush(). The stream is bound when the
+    writer is created, so a Live that redirects sys.stdout to itself never
+    loops back into it. It bypasses colorama's wrapper, whose autoreset
+    appends a reset to every write (and which strips codes when piped), so
+    the AnsiMinimizer alone decides the escape codes; the wrapper is kept
+    only where it converts them for a legacy Windows console.
+    """
+
+    def __init__(self, stream=None):
+        if stream is None:
+            stream = sys.stdout
+            if isinstance(stream, StreamWrapper) and not AnsiToWin32(sys.__stdout__).convert:
+                stream = sys.__stdout__
+        self.stream = stream
+        self.chars_written = 0
+        self.bytes_written = 0
+        self._parts: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.stream, 'encoding', None) or 'utf-8'
+
+    def write(self, data: str) -> int:
+        with self._lock:
+            self._parts.append(data)
+        return len(data)
+
+    def flush(self):
+        with self._lock:
+            if not self._parts:
+                return
+            data = "".join(self._parts)
+            self._parts.clear()
+            self.stream.write(data)
+            self.stream.flush()
+            self.chars_written += len(data)
+            self.bytes_written += len(data.encode(self.encoding, 'replace'))
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+    def fileno(self) -> int:
+        return self.stream.fileno()
+
+class ConsoleOverlay:
+    """Streams the frame renderer's output above a rich live region.
+
+    While a Live or Progress is on screen, raw frames would land inside
+    the region and force a full redraw on every write. Instead, completed
+    lines are collected here and a pump thread prints them through the
+    shared console a few times a second, so the region is redrawn once per
+    batch rather than once per line. In-progress animation frames are not
+    shown until their line completes; a BoardRow applies their ``\r`` and
+    ``\b`` redraws, so only the final state of each line is printed.
+    """
+
+    def __init__(self, console, refresh_per_second: float = 4):
+        self.console = console
+        self.batches = 0
+        self._interval = 1.0 / max(0.1, refresh_per_second)
+        self._decoder = AnsiDecoder()
+        self._lines = deque()
+        self._row = BoardRow()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._pump_loop, name="console-overlay", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def feed(self, data: str):
+        """Take a frame of raw output; queue the lines it completes"""
+        completed = []
+        self._row.feed(data, completed)
+        self._lines.extend(completed)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        if self._row.cells:
+            self._lines.append(self._row.render())
+            self._row = BoardRow()
+        self.pump()
+
+    def pump(self):
+        """Print every completed line in one go"""
+        chunks = []
+        while self._lines:
+            chunks.append(self._lines.popleft())
+        if chunks:
+            self.console.print(Text("\n").join(self._decoder.decode("\n".join(chunks))))
+            self.batches += 1
+
+    def _pump_loop(self):
+        while not self._stop.wait(self._interval):
+            self.pump()
+
+class FrameRenderer:
+    """Frame-buffered terminal writer shared by all output effects.
+
+    Effects write into a pending frame and report the time left until
+    their next deadline through advance(); the frame is written and
+    flushed once whenever the wait spans a full frame interval (or a frame
+    is overdue), instead of once per character.
+
+    Every flush is timed, and on a tty the kernel output queue is checked.
+    When the terminal falls behind (slow SSH link, multiplexer) the frame
+    interval stretches, so more animation frames land in each write and
+    superseded spinner and bar frames are dropped; text is never dropped.
+    """
+
+    # Fall behind when a write blocks for more than this share of a frame
+    BEHIND_LATENCY = 0.5
+    # Bytes waiting in the tty output queue that count as a backlog
+    BEHIND_QUEUED = 4096
+    MIN_FPS = 4
+
+    def __init__(self, stream=None, fps: int = 60, clock=None, minimize_ansi: bool = True):
+        self.stream = stream
+        self.clock = clock or RealClock()
+        self.minimizer = AnsiMinimizer() if minimize_ansi else None
+        self.base_interval = 1.0 / max(1, fps)
+        self.frame_interval = self.base_interval
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.bytes_written = 0
+        self.write_time = 0.0
+        self.write_latency = 0.0
+        self.write_latencies = LatencyHistogram()
+        self.queued_bytes = 0
+        self.overlay: Optional[ConsoleOverlay] = None
+        self._buffer: List[str] = []
+        self._last_is_frame = False
+        self._last_flush = self.clock.monotonic()
+
+    def write(self, data: str, frame: bool = False):
+        """Queue data for the next frame.
+
+        Animation frames (frame=True) redraw what the previous one drew, so
+        one that directly follows another replaces it in the buffer.
+        """
+        if frame and self._last_is_frame:
+            self._buffer[-1] = data
+            self.frames_dropped += 1
+        else:
+            self._buffer.append(data)
+        self._last_is_frame = frame
+
+    def advance(self, remaining: float) -> float:
+        """Given the time left until the caller's next deadline, emit the
+        frame if it is due and return how long the caller should now wait.
+
+        Waits shorter than a frame are skipped so their output batches into
+        the current frame; the caller's deadline absorbs the difference.
+        """
+        if remaining < self.frame_interval and \
+                self.clock.monotonic() - self._last_flush < self.frame_interval:
+            return 0.0
+        self.flush()
+        return max(0.0, remaining)
+
+    def sleep(self, remaining: float):
+        """Blocking variant of advance()"""
+        self.clock.sleep(self.advance(remaining))
+
+    def flush(self):
+        """Write the pending frame with a single write/flush pair"""
+        if not self._buffer:
+            return
+        frame = "".join(self._buffer)
+        self._buffer.clear()
+        self._last_is_frame = False
+        if self.overlay is not None:
+            # A rich live region owns the screen; it prints our lines
+            self.overlay.feed(frame)
+            self._last_flush = self.clock.monotonic()
+            return
+        if self.minimizer:
+            frame = self.minimizer.process(frame) + self.minimizer.end_frame()
+        stream = self.stream or sys.stdout
+        started = time.perf_counter()
+        stream.write(frame)
+        stream.flush()
+        latency = time.perf_counter() - started
+        self.write_latencies.record(int(latency * 1e9))
+        self.frames_written += 1
+        self.bytes_written += len(frame)
+        self.write_time += latency
+        self._last_flush = self.clock.monotonic()
+        self._adapt(latency, self._tty_queued(stream))
+
+    def _adapt(self, latency: float, queued: int):
+        """Stretch the frame interval while the terminal lags, relax it after"""
+        self.write_latency = latency if self.frames_written == 1 else 0.8 * self.write_latency + 0.2 * latency
+        self.queued_bytes = queued
+        if self.write_latency > self.frame_interval * self.BEHIND_LATENCY or queued > self.BEHIND_QUEUED:
+            self.frame_interval = min(self.frame_interval * 2, 1.0 / self.MIN_FPS)
+        elif self.write_latency < self.frame_interval * self.BEHIND_LATENCY / 4:
+            self.frame_interval = max(self.frame_interval * 0.9, self.base_interval)
+
+    @staticmethod
+    def _tty_queued(stream) -> int:
+        """Bytes still waiting in the kernel's tty output queue (0 if unknown)"""
+        if termios is None or not hasattr(termios, 'TIOCOUTQ'):
+            return 0
+        try:
+            fd = stream.fileno()
+            if not os.isatty(fd):
+                return 0
+            raw = fcntl.ioctl(fd, termios.TIOCOUTQ, b"\0\0\0\0")
+        except (AttributeError, OSError, ValueError):
+            return 0
+        return int.from_bytes(raw, sys.byteorder)
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second the terminal accepted while being written to"""
+        return self.bytes_written / self.write_time if self.write_time else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'fps': 1.0 / self.frame_interval,
+            'write_latency_ms': self.write_latency * 1000,
+            'throughput_bps': self.throughput,
+            'queued_bytes': self.queued_bytes,
+            'frames_written': self.frames_written,
+            'frames_dropped': self.frames_dropped,
+        }
+
+class Pacer:
+    """Paces one animation against absolute deadlines on the clock.
+
+    Each step moves the deadline forward by its delay instead of sleeping
+    for it, so time spent rendering and scheduling is absorbed rather than
+    added on top, and steps that are already overdue are batched into the
+    current frame instead of each paying a minimum sleep.
+    """
+
+    def __init__(self, clock, sink, pause):
+        self.clock = clock
+        self.sink = sink
+        self.pause = pause
+        self.deadline = clock.monotonic()
+
+    async def __call__(self, seconds: float):
+        self.deadline += max(0.0, seconds)
+        delay = self.sink.advance(self.deadline - self.clock.monotonic())
+        if delay > 0:
+            await self.pause(delay)
+
+@dataclass
+class OutputEvent:
+    timestamp: float
+    prefix: str
+    priority: Priority
+    text: str
+    line: str
+    color: str = ""
+    source: str = ""
+    monotonic: float = 0.0
+    cycle: int = 0
+
+class OutputSink:
+    """Destination for simulator output.
+
+    Animated sinks receive raw terminal frames through write() and the
+    time left until the next animation deadline through advance(); every
+    sink receives one emit() per completed output line.
+    """
+    animated = False
+
+    def write(self, data: str, frame: bool = False):
+        pass
+
+    def advance(self, remaining: float) -> float:
+        return 0.0
+
+    def flush(self):
+        pass
+
+    def emit(self, event: OutputEvent):
+        pass
+
+    def close(self):
+        self.flush()
+
+    async def run(self):
+        """Background work for the asyncio core (e.g. a frame ticker)"""
+
+class TTYSink(OutputSink):
+    """Animated terminal output through the frame renderer"""
+    animated = True
+
+    def __init__(self, renderer: FrameRenderer):
+        self.renderer = renderer
+
+    def write(self, data: str, frame: bool = False):
+        self.renderer.write(data, frame)
+
+    def advance(self, remaining: float) -> float:
+        return self.renderer.advance(remaining)
+
+    def flush(self):
+        self.renderer.flush()
+
+    def emit(self, event: OutputEvent):
+        # The line has already been drawn; commit the frame
+        self.renderer.flush()
+
+@functools.lru_cache(maxsize=None)
+def char_width(char: str) -> int:
+    """Terminal columns one character occupies (wcwidth-style)"""
+    if unicodedata.combining(char) or unicodedata.category(char) in ("Cc", "Cf", "Mn"):
+        return 0
+    if char in "\ufe0e\ufe0f":
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+class TerminalGeometry:
+    """Cached terminal size plus display-width helpers for fitting output.
+
+    The size is read once and again only after SIGWINCH (on_resize just
+    marks it stale, so it is safe as a signal handler); glyph widths are
+    memoised by char_width(), so effects fit their frames to the terminal
+    once per effect instead of measuring every frame.
+    """
+
+    def __init__(self):
+        self._size = os.terminal_size((80, 24))
+        self._stale = True
+        self.version = 0
+
+    def on_resize(self, signum=None, frame=None):
+        self._stale = True
+
+    @property
+    def size(self) -> os.terminal_size:
+        if self._stale:
+            self._stale = False
+            size = shutil.get_terminal_size()
+            if size != self._size:
+                self._size = size
+                self.version += 1
+        return self._size
+
+    @property
+    def width(self) -> int:
+        """Usable columns; the last one stays free so the cursor never
+        lands in the pending auto-wrap position"""
+        return max(1, self.size.columns - 1)
+
+    @staticmethod
+    def text_width(text: str) -> int:
+        return sum(map(char_width, text))
+
+    def truncate(self, text: str, width: int, ellipsis: str = "…") -> str:
+        """Cut plain text to at most ``width`` columns"""
+        if self.text_width(text) <= width:
+            return text
+        width -= self.text_width(ellipsis)
+        out, used = [], 0
+        for char in text:
+            used += char_width(char)
+            if used > width:
+                break
+            out.append(char)
+        return "".join(out) + ellipsis if width >= 0 else ""
+
+    def wrap(self, text: str, width: int) -> List[str]:
+        """Split plain text into lines of at most ``width`` columns,
+        breaking at the last space where there is one"""
+        if width <= 0 or self.text_width(text) <= width:
+            return [text]
+        lines, line, used = [], [], 0
+        for char in text:
+            w = char_width(char)
+            if used + w > width and char == " ":
+                lines.append("".join(line))
+                line, used = [], 0
+                continue
+            if used + w > width and line:
+                cut = len(line) - line[::-1].index(" ") - 1 if " " in line else len(line)
+                lines.append("".join(line[:cut]))
+                line = line[cut + 1:] if cut < len(line) else []
+                used = self.text_width(line)
+            line.append(char)
+            used += w
+        lines.append("".join(line))
+        return lines
+
+class BoardRow:
+    """One terminal row of the task board, with a minimal line discipline.
+
+    Effects write to a row exactly as they would to the terminal: ``\r``
+    and ``\b`` move the cursor, characters overwrite cells and ``\n``
+    completes the line, which is handed back for the scrolling log.
+    """
+
+    def __init__(self):
+        self.cells: List[tuple] = []  # (sgr style, char)
+        self.cursor = 0
+        self.style = ""
+        self.dirty = True
+
+    def feed(self, data: str, completed: List[str]):
+        pos = 0
+        for match in SGR_PATTERN.finditer(data):
+            self._feed_text(data[pos:match.start()], completed)
+            self.style = "" if match.group(1) in ("", "0") else self.style + match.group(0)
+            pos = match.end()
+        self._feed_text(data[pos:], completed)
+
+    def _feed_text(self, text: str, completed: List[str]):
+        for char in text:
+            if char == "\r":
+                self.cursor = 0
+            elif char == "\b":
+                self.cursor = max(0, self.cursor - 1)
+            elif char == "\n":
+                completed.append(self.render())
+                self.cells.clear()
+                self.cursor = 0
+            else:
+                width = char_width(char)
+                if width == 0:
+                    # Combining marks and selectors join the previous cell
+                    if self.cursor:
+                        style, prev = self.cells[self.cursor - 1]
+                        self.cells[self.cursor - 1] = (style, prev + char)
+                else:
+                    self._put(self.cursor, (self.style, char))
+                    if width == 2:
+                        # Right half of a wide glyph: an empty placeholder cell
+                        self._put(self.cursor + 1, (self.style, ""))
+                    self.cursor += width
+            self.dirty = True
+
+    def _put(self, index: int, cell: tuple):
+        cells = self.cells
+        if index == len(cells):
+            cells.append(cell)
+            return
+        if cells[index][1] == "" and index:
+            # Overwriting the right half of a wide glyph blanks its left half
+            cells[index - 1] = (cells[index - 1][0], " ")
+        elif index + 1 < len(cells) and cells[index + 1][1] == "":
+            # Overwriting the left half blanks the orphaned right half
+            cells[index + 1] = (cells[index + 1][0], " ")
+        cells[index] = cell
+
+    def render(self, width: Optional[int] = None) -> str:
+        cells = self.cells[:width]
+        if width is not None and len(self.cells) > width and self.cells[width][1] == "":
+            cells[-1] = (cells[-1][0], " ")  # Wide glyph cut in half at the edge
+        out = []
+        current = ""
+        for style, char in cells:
+            if style != current:
+                out.append(Style.RESET_ALL + style)
+                current = style
+            out.append(char)
+        if current:
+            out.append(Style.RESET_ALL)
+        return "".join(out)
+
+_board_row: contextvars.ContextVar = contextvars.ContextVar('board_row', default=None)
+
+class TaskBoardSink(OutputSink):
+    """Animated terminal output with one row per in-flight task.
+
+    The bottom of the terminal holds the line being typed followed by a
+    row for every running spinner or progress bar. Completed lines scroll
+    up above the board. A ticker draws a frame at the renderer's refresh
+    rate, moving the cursor to rewrite only the rows that changed; the
+    whole board is repainted only when lines scroll or rows come and go.
+    """
+    animated = True
+
+    def __init__(self, renderer: FrameRenderer, geometry: Optional[TerminalGeometry] = None):
+        self.renderer = renderer
+        self.geometry = geometry or TerminalGeometry()
+        self.main_row = BoardRow()
+        self.rows: List[BoardRow] = []
+        self._completed: List[str] = []
+        self._drawn_height = 0
+        self._geometry_version = -1
+        self._layout_changed = True
+        self._closed = False
+        self._real_flush = 0.0
+
+    @contextmanager
+    def task_row(self):
+        """Bind a new board row to the current task for its duration"""
+        row = BoardRow()
+        self.rows.append(row)
+        self._layout_changed = True
+        token = _board_row.set(row)
+        try:
+            yield row
+        finally:
+            _board_row.reset(token)
+            if row.cells:
+                self._completed.append(row.render())
+            self.rows.remove(row)
+            self._layout_changed = True
+
+    def write(self, data: str, frame: bool = False):
+        # Rows keep only their latest cells, so frames coalesce by themselves
+        (_board_row.get() or self.main_row).feed(data, self._completed)
+
+    def advance(self, remaining: float) -> float:
+        # Tasks keep their own deadlines; frames are drawn by the ticker
+        if remaining < self.renderer.frame_interval:
+            return 0.0
+        if self.renderer.clock.virtual:
+            # No ticker on a virtual clock. Virtual frames go by faster than
+            # anyone can watch, so draw at the frame rate in real time
+            now = time.monotonic()
+            if now - self._real_flush >= self.renderer.frame_interval:
+                self._real_flush = now
+                self.flush()
+        return remaining
+
+    async def run(self):
+        if self.renderer.clock.virtual:
+            # Ticking would drive the virtual clock one frame at a time
+            return
+        while not self._closed:
+            self.flush()
+            await asyncio.sleep(self.renderer.frame_interval)
+
+    def flush(self):
+        board = [self.main_row] + self.rows
+        width = self.geometry.width
+        if self.geometry.version != self._geometry_version:
+            # Resized: the terminal reflowed the board, so repaint it all
+            self._geometry_version = self.geometry.version
+            self._layout_changed = True
+        if self._completed or self._layout_changed:
+            # Scroll completed lines above the board and repaint it
+            if self._drawn_height:
+                self.renderer.write(f"\x1b[{self._drawn_height}A\r\x1b[J")
+            for line in self._completed:
+                self.renderer.write(line + "\n")
+            self._completed.clear()
+            for row in board:
+                self.renderer.write(row.render(width) + "\n")
+                row.dirty = False
+            self._drawn_height = len(board)
+            self._layout_changed = False
+        else:
+            for index, row in enumerate(board):
+                if row.dirty:
+                    up = self._drawn_height - index
+                    self.renderer.write(f"\x1b[{up}A\r{row.render(width)}\x1b[K\x1b[{up}B\r")
+                    row.dirty = False
+        self.renderer.flush()
+
+    def close(self):
+        self._closed = True
+        if self.main_row.cells:
+            self._completed.append(self.main_row.render())
+            self.main_row = BoardRow()
+        self.flush()
+        # Leave the cursor on the line after the scrolled output
+        if self._drawn_height:
+            self.renderer.write(f"\x1b[{self._drawn_height}A\r\x1b[J")
+            self.renderer.flush()
+        self._drawn_height = 0
+
+class LineSink(OutputSink):
+    """Plain text, one line per event, no escape codes or animation frames"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def emit(self, event: OutputEvent):
+        stream = self.stream or sys.stdout
+        stream.write(event.line + "\n")
+        stream.flush()
+
+class JsonlSink(OutputSink):
+    """Structured output, one JSON object per event"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def emit(self, event: OutputEvent):
+        record = {
+            'timestamp': round(event.timestamp, 6),
+            'prefix': event.prefix,
+            'priority': event.priority.name,
+            'text': event.text,
+        }
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        stream.flush()
+
+class NullSink(OutputSink):
+    """Discards all output"""
+
+class LayoutPane:
+    """Bounded line buffer backing one region of the live layout"""
+
+    def __init__(self, title: str, maxlen: int = 200):
+        self.title = title
+        self.lines = deque(maxlen=maxlen)
+        self.version = 0
+
+    def push(self, line: str, color: str = ""):
+        self.lines.append((line, color))
+        self.version += 1
+
+    def render(self, rows: int) -> Panel:
+        tail = list(self.lines)[-max(1, rows):]
+        text = Text("\n").join(Text.from_ansi(color + line) for line, color in tail)
+        # One row per line so the newest lines are never cropped by wrapping
+        text.no_wrap = True
+        text.overflow = "ellipsis"
+        return Panel(text, title=self.title, border_style="cyan")
+
+class LayoutSink(OutputSink):
+    """Multi-pane live view: log stream, thoughts, metrics and active tasks.
+
+    Events only append to bounded pane buffers. A refresher thread redraws
+    at most ``refresh_per_second`` times, and only the panes whose contents
+    changed since the previous redraw, so CPU use does not grow with the
+    event rate.
+    """
+
+    def __init__(self, simulator, refresh_per_second: float = 4):
+        self.sim = simulator
+        self.log_pane = LayoutPane("Log stream")
+        self.thought_pane = LayoutPane("Thoughts", 100)
+        self.redraws = 0
+        self._drawn: Dict[str, Any] = {}
+        self._interval = 1.0 / max(0.1, refresh_per_second)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        
+        self.layout = Layout()
+        self.layout.split_column(Layout(name="streams", ratio=3), Layout(name="status", ratio=2))
+        self.layout["streams"].split_row(Layout(name="log", ratio=3), Layout(name="thoughts", ratio=2))
+        self.layout["status"].split_row(Layout(name="metrics"), Layout(name="tasks"))
+        
+        self.live = Live(self.layout, console=simulator.console, auto_refresh=False)
+        self.live.start()
+        self._redraw()
+        self._thread = threading.Thread(target=self._refresh_loop, name="layout-refresh", daemon=True)
+        self._thread.start()
+
+    def emit(self, event: OutputEvent):
+        pane = self.thought_pane if event.source == "thought_process" else self.log_pane
+        pane.push(event.line, event.color)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self._redraw()
+        self.live.stop()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self._interval):
+            self._redraw()
+
+    def _pane_states(self) -> Dict[str, Any]:
+        sim = self.sim
+        return {
+            'log': self.log_pane.version,
+            'thoughts': self.thought_pane.version,
+            'metrics': (id(sim.metrics), round(sim.consciousness_level, 3),
+                        len(sim.neural_activity), sim.system_state),
+            'tasks': tuple(id(task) for task in sim.active_processes),
+        }
+
+    def _render_pane(self, name: str, rows: int):
+        if name == 'log':
+            return self.log_pane.render(rows)
+        if name == 'thoughts':
+            return self.thought_pane.render(rows)
+        if name == 'metrics':
+            return Panel(self.sim.create_dashboard(self.sim.metrics), title="Metrics", border_style="cyan")
+        
+        table = Table(show_header=True, header_style="bold magenta", expand=True)
+        table.add_column("Activity", style="cyan")
+        table.add_column("Started", style="green")
+        for task in list(self.sim.active_processes):
+            table.add_row(task['name'], task['started'].strftime('%H:%M:%S'))
+        return Panel(table, title="Active tasks", border_style="cyan")
+
+    def _redraw(self):
+        with self._lock:
+            states = self._pane_states()
+            changed = [name for name, state in states.items() if self._drawn.get(name) != state]
+            if not changed:
+                return
+            
+            # Stream panes take 3/5 of the height, minus the panel borders
+            rows = max(1, self.live.console.size.height * 3 // 5 - 2)
+            for name in changed:
+                self.layout[name].update(self._render_pane(name, rows))
+            self._drawn.update(states)
+            self.live.refresh()
+            self.redraws += 1
+
+OUTPUT_SINKS = {
+    'line': LineSink,
+    'jsonl': JsonlSink,
+    'null': NullSink,
+}
+
+# Maximum queued render jobs before activities are held back
+RENDER_BACKLOG = 32
+
+class OutputMultiplexer:
+    """Funnels whole-line render jobs from any thread to one consumer.
+
+    Producers only append to a deque (atomic, so no lock and no waiting on
+    the terminal). The consumer is the terminal writer task in asyncio
+    mode, or otherwise the thread that owns the simulator, and it runs
+    each job to completion before taking the next, so lines from
+    different threads never interleave.
+    """
+
+    def __init__(self):
+        self.owner = threading.get_ident()
+        self._jobs: deque = deque()
+        self._busy = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        """True while an asyncio consumer owns the terminal"""
+        return self._loop is not None
+
+    def on_owner_thread(self) -> bool:
+        return threading.get_ident() == self.owner
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def submit(self, job):
+        """Queue a job from any thread"""
+        self._jobs.append(job)
+        loop = self._loop
+        if loop is None:
+            return
+        if self.on_owner_thread():
+            self._wakeup.set()
+        else:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass  # Loop already closed; the owner drains it synchronously
+
+    def drain(self, run):
+        """Run queued jobs on the owner thread outside the event loop"""
+        while self._jobs:
+            run(self._jobs.popleft())
+
+    async def consume(self, run):
+        """Consumer task: await each queued job in order"""
+        self._loop = asyncio.get_running_loop()
+        self.owner = threading.get_ident()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        try:
+            while True:
+                while self._jobs:
+                    self._busy = True
+                    try:
+                        await run(self._jobs.popleft())
+                    finally:
+                        self._busy = False
+                self._idle.set()
+                self._wakeup.clear()
+                if not self._jobs:
+                    await self._wakeup.wait()
+        finally:
+            self._loop = None
+
+    async def join(self):
+        """Wait until every queued job has been rendered"""
+        while self.running and (self._jobs or self._busy):
+            self._idle.clear()
+            await self._idle.wait()
+
+class ActivityProfiler:
+    """--profile: CPU (cProfile) or allocation (tracemalloc) profiles split
+    into sections: boot, the consciousness loop and each activity by name.
+
+    Entering a section suspends the enclosing one, so an activity's cost
+    is charged to the activity and not also to the loop around it. With
+    several asyncio processes, activities overlap and the latest one to
+    start is charged until it ends.
+    """
+
+    TOP = 20
+
+    def __init__(self, mode: str, prefix: str = "ai_profile"):
+        self.mode = mode
+        self.prefix = prefix
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.allocations: Dict[str, Dict[tuple, list]] = {}
+        self.peaks: Dict[str, int] = {}
+        self.runs: Dict[str, int] = {}
+        self._stack: List[str] = []
+        self._snapshot = None
+
+    def start(self):
+        if self.mode == 'alloc':
+            tracemalloc.start()
+            self._snapshot = self._take_snapshot()
+
+    @contextmanager
+    def section(self, name: str):
+        previous = self._active()
+        self._stack.append(name)
+        self.runs[name] = self.runs.get(name, 0) + 1
+        self._switch(previous, name)
+        try:
+            yield
+        finally:
+            active = self._active()
+            del self._stack[len(self._stack) - 1 - self._stack[::-1].index(name)]
+            if self._active() != active:
+                self._switch(active, self._active())
+
+    def _active(self) -> Optional[str]:
+        return self._stack[-1] if self._stack else None
+
+    def _switch(self, old: Optional[str], new: Optional[str]):
+        if self.mode == 'cpu':
+            if old:
+                self.profiles[old].disable()
+            if new:
+                self.profiles.setdefault(new, cProfile.Profile()).enable()
+            return
+        
+        # Allocation mode: charge what is newly live since the last switch
+        snapshot = self._take_snapshot()
+        if old:
+            allocations = self.allocations.setdefault(old, {})
+            for stat in snapshot.compare_to(self._snapshot, 'lineno'):
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    totals = allocations.setdefault((frame.filename, frame.lineno), [0, 0])
+                    totals[0] += stat.size_diff
+                    totals[1] += max(0, stat.count_diff)
+            self.peaks[old] = max(self.peaks.get(old, 0), tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self._snapshot = snapshot
+
+    @staticmethod
+    def _take_snapshot():
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+
+    def write(self) -> List[str]:
+        """Stop profiling and write the reports; returns the files written"""
+        while self._stack:
+            self._switch(self._stack.pop(), self._active())
+        if self.mode == 'alloc':
+            tracemalloc.stop()
+            return [self._write_alloc()]
+        written = []
+        for name, profile in self.profiles.items():
+            path = f"{self.prefix}.cpu.{name}.pstats"
+            profile.dump_stats(path)
+            written.append(path)
+        return [self._write_cpu()] + written
+
+    def _write_cpu(self) -> str:
+        path = f"{self.prefix}.cpu.txt"
+        stats = {name: pstats.Stats(profile) for name, profile in self.profiles.items()}
+        with open(path, 'w', encoding='utf-8') as f:
+            for name in sorted(stats, key=lambda name: -stats[name].total_tt):
+                f.write(f"=== {name}: {self.runs.get(name, 0)} runs, {stats[name].total_tt:.3f} s CPU ===\n")
+                stats[name].stream = f
+                stats[name].sort_stats('cumulative').print_stats(self.TOP)
+        return path
+
+    def _write_alloc(self) -> str:
+        path = f"{self.prefix}.alloc.txt"
+        totals = {name: sum(size for size, _ in lines.values()) for name, lines in self.allocations.items()}
+        with open(path, 'w', encoding='utf-8') as f:
+            for name in sorted(totals, key=lambda name: -totals[name]):
+                f.write(f"=== {name}: {self.runs.get(name, 0)} runs, {totals[name] / 1024:.1f} KiB newly live, "
+                        f"peak traced {self.peaks.get(name, 0) / 1024:.1f} KiB ===\n")
+                top = sorted(self.allocations[name].items(), key=lambda item: -item[1][0])[:self.TOP]
+                for (filename, lineno), (size, count) in top:
+                    f.write(f"{size / 1024:10.1f} KiB {count:8d} blocks  {filename}:{lineno}\n")
+                f.write("\n")
+        return path
+
+def profiled(section: str):
+    """Charge a simulator coroutine's work to a --profile section"""
+    def decorate(coro_fn):
+        @functools.wraps(coro_fn)
+        async def wrapper(self, *args, **kwargs):
+            with self.profile_section(section):
+                return await coro_fn(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+def synchronous(coro_fn):
+    """Expose a simulator coroutine as a blocking method (see AISimulator.run_sync)"""
+    @functools.wraps(coro_fn)
+    def wrapper(self, *args, **kwargs):
+        return self.run_sync(coro_fn(self, *args, **kwargs))
+    wrapper.__name__ = coro_fn.__name__.removesuffix('_async')
+    return wrapper
+
+class LatencyHistogram:
+    """Fixed-size, log-bucketed histogram of durations in nanoseconds.
+
+    Each power of two is split into SUB_BUCKETS linear buckets, so every
+    value is kept to within 1/SUB_BUCKETS of itself (12.5%) whatever its
+    magnitude, in a few hundred counters.
+    """
+
+    SUB_BITS = 3
+    SUB_BUCKETS = 1 << SUB_BITS
+
+    def __init__(self):
+        self.counts = [0] * (64 * self.SUB_BUCKETS)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @classmethod
+    def bucket(cls, ns: int) -> int:
+        exp = ns.bit_length() - 1
+        if exp < cls.SUB_BITS:
+            return max(0, ns)
+        return (exp - cls.SUB_BITS + 1) * cls.SUB_BUCKETS + ((ns >> (exp - cls.SUB_BITS)) & (cls.SUB_BUCKETS - 1))
+
+    @classmethod
+    def upper_bound(cls, index: int) -> int:
+        """Largest value that falls in a bucket"""
+        if index < cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.SUB_BUCKETS - 1
+        return ((cls.SUB_BUCKETS + index % cls.SUB_BUCKETS + 1) << shift) - 1
+
+    def record(self, ns: int):
+        self.counts[self.bucket(ns)] += 1
+        if not self.count or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.count += 1
+        self.total += ns
+
+    def percentile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-th percentile"""
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def cumulative(self, bounds: List[int]) -> List[int]:
+        """Values counted in buckets lying wholly at or below each bound
+        (ascending, in ns), i.e. each bound rounded down to a bucket edge"""
+        counts = self.counts
+        totals = []
+        seen = index = 0
+        for bound in bounds:
+            while index < len(counts) and self.upper_bound(index) <= bound:
+                seen += counts[index]
+                index += 1
+            totals.append(seen)
+        return totals
+
+class Measurement:
+    """Context manager timing one operation into PerfStats; time added
+    to ``excluded`` (ns) is left out of what is recorded"""
+
+    __slots__ = ('stats', 'name', 'started', 'rss', 'excluded', 'elapsed')
+
+    def __init__(self, stats: 'PerfStats', name: str):
+        self.stats = stats
+        self.name = name
+        self.rss = None
+        self.excluded = 0
+        self.elapsed = 0
+
+    def __enter__(self):
+        stats = self.stats
+        if stats.rss_every and stats.histogram(self.name).count % stats.rss_every == 0:
+            self.rss = stats.read_rss()
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter_ns() - self.started
+        self.stats.record(self.name, max(0, self.elapsed - self.excluded), self.rss)
+        return False
+
+class PerfStats:
+    """Latency histograms per operation (render, sleep, activity, metrics).
+
+    Timing costs two perf_counter_ns() calls and a bucket increment. With
+    ``rss_every`` set, every n-th run of each operation also reads the
+    process RSS before and after (one cached psutil.Process), keeping the
+    peak and the largest growth seen.
+    """
+
+    def __init__(self, rss_every: int = 0):
+        self.rss_every = rss_every
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.rss_peak: Dict[str, int] = {}
+        self.rss_growth: Dict[str, int] = {}
+        self._process = None
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return histogram
+
+    def measure(self, name: str) -> Measurement:
+        return Measurement(self, name)
+
+    def read_rss(self) -> Optional[int]:
+        try:
+            if self._process is None:
+                self._process = psutil.Process()
+            return self._process.memory_info().rss
+        except psutil.Error:
+            return None
+
+    def record(self, name: str, ns: int, rss_before: Optional[int] = None):
+        self.histogram(name).record(ns)
+        if rss_before is not None:
+            rss = self.read_rss()
+            if rss is not None:
+                self.rss_peak[name] = max(self.rss_peak.get(name, 0), rss)
+                self.rss_growth[name] = max(self.rss_growth.get(name, 0), rss - rss_before)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-operation figures in microseconds, plus the raw buckets"""
+        summary = {}
+        for name, histogram in sorted(self.histograms.items()):
+            entry = {
+                'count': histogram.count,
+                'mean_us': round(histogram.mean / 1000, 3),
+                'min_us': round(histogram.min / 1000, 3),
+                'p50_us': round(histogram.percentile(50) / 1000, 3),
+                'p90_us': round(histogram.percentile(90) / 1000, 3),
+                'p99_us': round(histogram.percentile(99) / 1000, 3),
+                'max_us': round(histogram.max / 1000, 3),
+                'buckets': {LatencyHistogram.upper_bound(index): count
+                            for index, count in enumerate(histogram.counts) if count},
+            }
+            if name in self.rss_peak:
+                entry['rss_peak_bytes'] = self.rss_peak[name]
+                entry['rss_growth_bytes'] = self.rss_growth[name]
+            summary[name] = entry
+        return summary
+
+    def table(self) -> Table:
+        table = Table(title="Operation Latency", show_header=True, header_style="bold magenta")
+        table.add_column("Operation", style="cyan", no_wrap=True)
+        table.add_column("Count", justify="right", no_wrap=True)
+        for column in ("Mean", "p50", "p90", "p99", "Max"):
+            table.add_column(column, justify="right", style="green", no_wrap=True)
+        if self.rss_peak:
+            table.add_column("RSS peak", justify="right", style="yellow", no_wrap=True)
+        for name, entry in self.summary().items():
+            row = [name, str(entry['count'])] + [
+                format_duration(entry[key] / 1e6)
+                for key in ('mean_us', 'p50_us', 'p90_us', 'p99_us', 'max_us')]
+            if self.rss_peak:
+                peak = entry.get('rss_peak_bytes')
+                row.append(f"{peak / 1024 / 1024:.1f} MB" if peak else "-")
+            table.add_row(*row)
+        return table
+
+def format_duration(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+# Histogram buckets (seconds) for latencies on the metrics endpoint
+METRICS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class MetricsWriter:
+    """Builds one Prometheus text-format exposition"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    @staticmethod
+    def labels(labels: Dict[str, Any]) -> str:
+        if not labels:
+            return ""
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                   for value in labels.values())
+        return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+    def family(self, name: str, kind: str, help_text: str):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value, labels: Optional[Dict[str, Any]] = None):
+        self.lines.append(f"{name}{self.labels(labels)} {value}")
+
+    def histogram(self, name: str, histogram: LatencyHistogram, labels: Optional[Dict[str, Any]] = None):
+        labels = labels or {}
+        totals = histogram.cumulative([int(bound * 1e9) for bound in METRICS_BUCKETS])
+        for bound, total in zip(METRICS_BUCKETS, totals):
+            self.sample(f"{name}_bucket", total, {**labels, 'le': bound})
+        self.sample(f"{name}_bucket", histogram.count, {**labels, 'le': "+Inf"})
+        self.sample(f"{name}_sum", histogram.total / 1e9, labels)
+        self.sample(f"{name}_count", histogram.count, labels)
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.server.collect().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep request lines off the terminal
+
+class MetricsServer:
+    """--metrics-port: serves ``collect()`` over HTTP from a daemon thread.
+
+    ``collect`` only formats counters the simulator already keeps, so a
+    scrape costs the same however often it comes and never samples the
+    system itself.
+    """
+
+    def __init__(self, port: int, collect, host: str = '127.0.0.1'):
+        self.httpd = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+        self.httpd.collect = collect
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="MetricsServer", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+# Log records held for the background writer before new ones are dropped
+LOG_QUEUE_SIZE = 10000
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queues records without ever blocking; counts what a full queue drops"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class BatchedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating log file written a batch at a time.
+
+    emit() only formats and buffers the line; flush() writes the batch
+    with one write call and rolls the file over by its own byte count
+    (the stock handler seeks and flushes on every record to check).
+    """
+
+    def __init__(self, filename, maxBytes: int = 0, backupCount: int = 0):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount)
+        self._pending: List[str] = []
+        self._size = self.stream.seek(0, 2)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            if not self._pending:
+                return
+            data = "".join(self._pending)
+            self._pending.clear()
+            size = len(data.encode(self.stream.encoding, 'replace'))
+            if self.maxBytes and self._size and self._size + size > self.maxBytes:
+                self.doRollover()
+                self._size = 0
+            self.stream.write(data)
+            self.stream.flush()
+            self._size += size
+
+    def close(self):
+        self.flush()
+        super().close()
+
+# Codecs for closed log segments: opener and file suffix
+LOG_CODECS = {
+    'gzip': (functools.partial(gzip.open, compresslevel=6), '.gz'),
+    'lzma': (lzma.open, '.xz'),
+}
+
+def log_segments(filename: str) -> List[tuple]:
+    """(sequence, path) of every closed segment of a log file, oldest first"""
+    directory, name = os.path.split(os.path.abspath(filename))
+    pattern = re.compile(rf"{re.escape(name)}\.(\d{{6}})(\.gz|\.xz)?")
+    segments = []
+    for entry in os.listdir(directory):
+        match = pattern.fullmatch(entry)
+        if match:
+            segments.append((int(match.group(1)), os.path.join(directory, entry)))
+    return sorted(segments)
+
+def read_log_segments(filename: str):
+    """Yield the lines of a segmented log, oldest segment first, ending
+    with the active file; compressed segments are decompressed on the fly"""
+    openers = {suffix: opener for opener, suffix in LOG_CODECS.values()}
+    for _, path in log_segments(filename):
+        opener = openers.get(os.path.splitext(path)[1], open)
+        try:
+            with opener(path, 'rt', encoding='utf-8') as f:
+                yield from f
+        except FileNotFoundError:
+            continue  # Pruned while we were reading
+    if os.path.exists(filename):
+        with open(filename, encoding='utf-8') as f:
+            yield from f
+
+class CompressedSegmentHandler(BatchedRotatingFileHandler):
+    """Log file rolled into numbered segments, compressed under a byte budget.
+
+    On rollover the active file becomes the next segment (``log.000042``)
+    and is compressed on a background thread, so the log writer carries on
+    at once. At each rollover and after each compression the oldest
+    segments are deleted until they fit in ``budget`` bytes with room left
+    for the active file to grow to a full segment (``budget`` / 5).
+    read_log_segments() streams them back as one ordered log.
+    """
+
+    SEGMENTS_PER_BUDGET = 5
+
+    def __init__(self, filename: str, budget: int, codec: str = 'gzip'):
+        super().__init__(filename, maxBytes=max(1, budget // self.SEGMENTS_PER_BUDGET))
+        self.opener, self.suffix = LOG_CODECS[codec]
+        self.budget = budget
+        self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+        segments = log_segments(filename)
+        self._seq = segments[-1][0] if segments else 0
+        # Finish segments a previous run left uncompressed
+        for _, path in segments:
+            if not path.endswith(tuple(suffix for _, suffix in LOG_CODECS.values())):
+                self._compressor.submit(self._compress, path)
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self._seq += 1
+        segment = f"{self.baseFilename}.{self._seq:06d}"
+        # Pruned on the compressor thread, ahead of the new segment
+        self._compressor.submit(self._prune)
+        if os.path.exists(self.baseFilename):
+            os.replace(self.baseFilename, segment)
+            self._compressor.submit(self._compress, segment)
+        self.stream = self._open()
+
+    def _compress(self, segment: str):
+        target = segment + self.suffix
+        try:
+            with open(segment, 'rb') as src, self.opener(target + ".part", 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        except FileNotFoundError:
+            return  # Already pruned
+        # Make room before the compressed segment appears
+        self._prune(os.path.getsize(target + ".part"))
+        os.replace(target + ".part", target)
+        os.remove(segment)
+
+    def _prune(self, incoming: int = 0):
+        """Delete the oldest segments until they, ``incoming`` more bytes
+        and a full active file fit the budget.
+
+        Segments still waiting for compression are left out; they are
+        counted once they have shrunk.
+        """
+        sizes = [(path, os.path.getsize(path)) for _, path in log_segments(self.baseFilename)
+                 if path.endswith(self.suffix)]
+        total = sum(size for _, size in sizes) + incoming + self.maxBytes
+        for path, size in sizes:
+            if total <= self.budget:
+                break
+            os.remove(path)
+            total -= size
+
+    def close(self):
+        super().close()
+        self._compressor.shutdown(wait=True)
+
+class LogWriter:
+    """Background thread that drains the log queue into the real handlers.
+
+    Each pass takes everything queued so far, hands it to the handlers and
+    flushes them once, so disk writes happen per batch and never on the
+    thread that logged.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batches = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Write out everything queued so far, then end the thread"""
+        self.queue.put(None)
+        self._thread.join()
+        for handler in self.handlers:
+            handler.close()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while batch[-1] is not None:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is None:
+                    break
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            self.batches += 1
+            if batch[-1] is None:
+                return
+
+class BackgroundFileWriter:
+    """Append-only file fed from the render path, written by a thread.
+
+    Subclasses serialise records into memory with _append(); a background
+    thread writes whatever has collected every ``flush_interval`` seconds,
+    so emitting never waits on disk. ``fsync`` sets durability: 'never'
+    leaves write-back to the OS, 'batch' syncs after every write, 'close'
+    once when the file is closed.
+    """
+
+    FSYNC_POLICIES = ('never', 'batch', 'close')
+
+    def __init__(self, path: str, mode: str, fsync: str = 'batch', flush_interval: float = 1.0):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"unknown fsync policy: {fsync}")
+        binary = 'b' in mode
+        self.file = open(path, mode) if binary else open(path, mode, encoding='utf-8')
+        self.fsync = fsync
+        self.records = 0
+        self.syncs = 0
+        self.offset = self.file.seek(0, 2)  # where the next _append() lands
+        self._empty = b"" if binary else ""
+        self._interval = flush_interval
+        self._pending: list = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, name=type(self).__name__, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _append(self, data) -> int:
+        """Queue serialised data; returns the file offset it will occupy"""
+        with self._lock:
+            offset = self.offset
+            self._pending.append(data)
+            self.offset += len(data)
+            return offset
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            data = self._empty.join(self._pending)
+            self._pending.clear()
+        self.file.write(data)
+        self.file.flush()
+        if self.fsync == 'batch':
+            self._sync()
+
+    def close(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.flush()
+        if self.fsync == 'close':
+            self._sync()
+        self.file.close()
+
+    def _sync(self):
+        os.fsync(self.file.fileno())
+        self.syncs += 1
+
+    def _flush_loop(self):
+        while not self._stop.wait(self._interval):
+            self.flush()
+
+JOURNAL_FIELDS = ('mono', 'wall', 'source', 'prefix', 'priority', 'color', 'text', 'cycle')
+JOURNAL_VERSION = 1
+
+class EventJournal(BackgroundFileWriter):
+    """Compact JSONL record of every emitted event, for offline analysis.
+
+    Each session starts with a header line naming the schema; every other
+    line is one event with exactly the JOURNAL_FIELDS keys (``color`` is
+    the theme key, ``cycle`` the consciousness cycle, 0 outside the loop).
+    """
+
+    def __init__(self, path: str, fsync: str = 'batch', flush_interval: float = 1.0):
+        super().__init__(path, 'a', fsync, flush_interval)
+        self._append(self._dumps({
+            'schema': 'ai_sim.journal', 'version': JOURNAL_VERSION,
+            'fields': list(JOURNAL_FIELDS), 'started': round(time.time(), 6),
+        }))
+        self.start()
+
+    @staticmethod
+    def _dumps(record: Dict[str, Any]) -> str:
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+    def record(self, event: OutputEvent):
+        self._append(self._dumps({
+            'mono': round(event.monotonic, 6),
+            'wall': round(event.timestamp, 6),
+            'source': event.source,
+            'prefix': event.prefix,
+            'priority': event.priority.name,
+            'color': getattr(event.color, 'key', None),
+            'text': event.text,
+            'cycle': event.cycle,
+        }))
+        self.records += 1
+
+TRACE_CATEGORIES = {
+    '_pause': 'sleep', 'wait': 'sleep',
+    '_render_now': 'render', '_run_job': 'render',
+    '_emit_line': 'animation', '_typewriter': 'animation', '_glitch': 'animation',
+    '_rainbow': 'animation', '_breathing': 'animation', '_spinner': 'animation',
+    '_progress_bar': 'animation', '_wave': 'animation',
+}
+
+# Plumbing and per-frame helpers left out of --trace: their spans would
+# outnumber the rest without saying where time goes. The signal handler's
+# path (interrupt, emit_line, render) is left out too: recording a span
+# takes the writer's lock, which the interrupted code may be holding.
+# heartbeat_monitor would be one span lasting the whole run.
+TRACE_SKIP = {
+    'run_sync', 'live_region', 'performance_monitor', 'profile_section', 'trace_span',
+    'start_trace', 'close_trace', 'emit_event', 'make_event', 'timestamp',
+    'kernel_timestamp', 'priority_prefix', 'sink_frame_interval', 'pacer', 'fit_line',
+    'log_to_file', '_spinner_cells', '_measure_render',
+    'interrupt', 'emit_line', 'render', 'heartbeat_monitor',
 }
 
+class Span:
+    """Context manager writing one complete trace event on exit"""
+
+    __slots__ = ('writer', 'name', 'cat', 'args', 'tid', 'started')
+
+    def __init__(self, writer: 'TraceWriter', name: str, cat: str, args: Optional[Dict[str, Any]] = None):
+        self.writer = writer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.tid = self.writer.track()
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.writer.complete(self, time.perf_counter_ns())
+        return False
+
+class TraceWriter(BackgroundFileWriter):
+    """--trace: Chrome trace-event JSON of simulator method calls,
+    animations and sleeps, for Perfetto or about://tracing.
+
+    Every span is a complete ("X") event in microseconds since the trace
+    started. Each thread gets a track, and so does each asyncio task, so
+    activities overlapping on the event loop still nest correctly; tracks
+    are named after the task or thread and its OS thread id. Events are
+    streamed to disk in batches, and the viewers accept the array without
+    its closing bracket, so a trace cut short by a crash still loads.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        super().__init__(path, 'w', 'never', flush_interval)
+        self.pid = os.getpid()
+        self._origin = time.perf_counter_ns()
+        self._ids = itertools.count(1)
+        self._threads: Dict[int, int] = {}
+        self._tasks = weakref.WeakKeyDictionary()
+        self._names: Dict[str, str] = {}
+        self.closed = False
+        self._append("[" + self._dumps({
+            'ph': 'M', 'name': 'process_name', 'pid': self.pid, 'tid': 0,
+            'args': {'name': f"{HOSTNAME} ({MODEL_VERSION})"},
+        }))
+        self.start()
+
+    @staticmethod
+    def _dumps(event: Dict[str, Any]) -> str:
+        return json.dumps(event, ensure_ascii=False, separators=(',', ':'))
+
+    def span(self, name: str, cat: str = 'method', args: Optional[Dict[str, Any]] = None) -> Span:
+        return Span(self, name, cat, args)
+
+    def traced(self, method, cat: str = 'method'):
+        """Wrap a bound method (or coroutine method) in a span per call"""
+        name = method.__name__
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def wrapper(*args, **kwargs):
+                with Span(self, name, cat):
+                    return await method(*args, **kwargs)
+        else:
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                with Span(self, name, cat):
+                    return method(*args, **kwargs)
+        return wrapper
+
+    def track(self) -> int:
+        """Track id of the calling asyncio task, or else of the thread"""
+        loop = asyncio._get_running_loop()
+        task = asyncio.current_task(loop) if loop else None
+        if task is not None:
+            tid = self._tasks.get(task)
+            if tid is None:
+                tid = self._tasks[task] = self._new_track(task.get_name())
+            return tid
+        ident = threading.get_ident()
+        tid = self._threads.get(ident)
+        if tid is None:
+            tid = self._threads[ident] = self._new_track(threading.current_thread().name)
+        return tid
+
+    def _new_track(self, label: str) -> int:
+        tid = next(self._ids)
+        for name, args in (('thread_name', {'name': f"{label} (tid {threading.get_native_id()})"}),
+                           ('thread_sort_index', {'sort_index': tid})):
+            self._append(",\n" + self._dumps({'ph': 'M', 'name': name, 'pid': self.pid, 'tid': tid, 'args': args}))
+        return tid
+
+    def complete(self, span: Span, ended: int):
+        if self.closed:
+            return
+        name = self._names.get(span.name)
+        if name is None:
+            name = self._names[span.name] = json.dumps(span.name, ensure_ascii=False)
+        args = f',"args":{self._dumps(span.args)}' if span.args else ""
+        self._append(f',\n{{"ph":"X","name":{name},"cat":"{span.cat}","pid":{self.pid},"tid":{span.tid},'
+                     f'"ts":{(span.started - self._origin) / 1000:.3f},"dur":{(ended - span.started) / 1000:.3f}{args}}}')
+        self.records += 1
+
+    def close(self):
+        self.closed = True
+        self._append("\n]\n")
+        super().close()
+
+# Session recordings: MAGIC, the start time, then a stream of records, each
+# RECORD_HEADER (kind, payload length, seconds since start) plus payload.
+# Closing appends an index of every keyframe and a TRAILER pointing at it.
+SESSION_MAGIC = b"AISESS\x00\x01"
+SESSION_HEADER = struct.Struct('<8sd')
+RECORD_HEADER = struct.Struct('<BId')
+EVENT_HEAD = struct.Struct('<dBII')       # wall time, priority, cycle, text tail
+KEYFRAME_HEAD = struct.Struct('<IH')      # events before it, screen lines
+INDEX_ENTRY = struct.Struct('<dQI')       # time, record offset, events before it
+TRAILER = struct.Struct('<Q8s')           # index record offset, SESSION_MAGIC
+RECORD_EVENT, RECORD_KEYFRAME, RECORD_INDEX = 1, 2, 3
+
+def _pack_str(text: str) -> bytes:
+    data = text.encode('utf-8')
+    return struct.pack('<I', len(data)) + data
+
+def _unpack_str(buf, pos: int) -> tuple:
+    size, = struct.unpack_from('<I', buf, pos)
+    pos += 4
+    return str(buf[pos:pos + size], 'utf-8'), pos + size
+
+class SessionRecorder(BackgroundFileWriter):
+    """Binary recording of every output event with its timing.
+
+    Every ``keyframe_interval`` seconds (or ``keyframe_events`` events) a
+    keyframe stores the last screenful of lines, so a replay can seek to a
+    keyframe, repaint it and carry on from there without reading anything
+    before it. The keyframe index written on close makes that an O(log n)
+    lookup; a recording cut short still replays (the reader rescans).
+    """
+
+    KEYFRAME_LINES = 24
+
+    def __init__(self, path: str, clock, fsync: str = 'close',
+                 keyframe_interval: float = 30.0, keyframe_events: int = 256):
+        super().__init__(path, 'wb', fsync)
+        self.clock = clock
+        self.keyframes: List[tuple] = []
+        self._start = clock.monotonic()
+        self._screen = deque(maxlen=self.KEYFRAME_LINES)
+        self._keyframe_interval = keyframe_interval
+        self._keyframe_events = keyframe_events
+        self._append(SESSION_HEADER.pack(SESSION_MAGIC, clock.time()))
+        self._keyframe(0.0)
+        self.start()
+
+    def _record(self, kind: int, t: float, payload: bytes) -> int:
+        return self._append(RECORD_HEADER.pack(kind, len(payload), t) + payload)
+
+    def _keyframe(self, t: float):
+        parts = [KEYFRAME_HEAD.pack(self.records, len(self._screen))]
+        for key, code, line in self._screen:
+            parts += [_pack_str(key), _pack_str(code), _pack_str(line)]
+        offset = self._record(RECORD_KEYFRAME, t, b"".join(parts))
+        self.keyframes.append((t, offset, self.records))
+
+    def record(self, event: OutputEvent):
+        t = max(0.0, event.monotonic - self._start)
+        last_t, _, last_count = self.keyframes[-1]
+        if t - last_t >= self._keyframe_interval or self.records - last_count >= self._keyframe_events:
+            self._keyframe(t)
+        key = getattr(event.color, 'key', "")
+        code = "" if key else event.color
+        # The text usually ends the line; then only its length is stored
+        tail = len(event.text) if event.text and event.line.endswith(event.text) else 0
+        self._record(RECORD_EVENT, t, b"".join([
+            EVENT_HEAD.pack(event.timestamp, event.priority.value, event.cycle, tail),
+            _pack_str(event.source), _pack_str(event.prefix), _pack_str(key),
+            _pack_str(code), _pack_str("" if tail else event.text), _pack_str(event.line),
+        ]))
+        self._screen.append((key, code, event.line))
+        self.records += 1
+
+    def close(self):
+        index = b"".join(INDEX_ENTRY.pack(*entry) for entry in self.keyframes)
+        offset = self._record(RECORD_INDEX, self.clock.monotonic() - self._start, index)
+        self._append(TRAILER.pack(offset, SESSION_MAGIC))
+        super().close()
+
+@dataclass
+class RecordedEvent:
+    t: float
+    event: OutputEvent
+    key: str
+
+class SessionReader:
+    """Random access to a session recording, through mmap by default.
+
+    Records are decoded lazily straight from the mapping, so a long
+    recording is paged in only where it is read.
+    """
+
+    def __init__(self, path: str, use_mmap: bool = True):
+        with open(path, 'rb') as f:
+            if use_mmap:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = f.read()
+        magic, self.started = SESSION_HEADER.unpack_from(self.data, 0)
+        if magic != SESSION_MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        self.end = len(self.data)
+        self.keyframes = self._read_index() or self._scan_index()
+        self.times = [t for t, _, _ in self.keyframes]
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def _read_index(self) -> List[tuple]:
+        if self.end < SESSION_HEADER.size + TRAILER.size:
+            return []
+        offset, magic = TRAILER.unpack_from(self.data, self.end - TRAILER.size)
+        if magic != SESSION_MAGIC or offset >= self.end:
+            return []
+        kind, size, self.duration = RECORD_HEADER.unpack_from(self.data, offset)
+        if kind != RECORD_INDEX:
+            return []
+        self.end = offset
+        start = offset + RECORD_HEADER.size
+        return list(INDEX_ENTRY.iter_unpack(self.data[start:start + size]))
+
+    def _scan_index(self) -> List[tuple]:
+        """Rebuild the keyframe index of a recording that was not closed"""
+        keyframes = []
+        for kind, t, offset, _ in self.records(SESSION_HEADER.size):
+            if kind == RECORD_KEYFRAME:
+                count, = struct.unpack_from('<I', self.data, offset + RECORD_HEADER.size)
+                keyframes.append((t, offset, count))
+            self.duration = t
+        return keyframes
+
+    def records(self, offset: int):
+        """Yield (kind, t, record offset, payload offset) from offset on"""
+        while offset + RECORD_HEADER.size <= self.end:
+            kind, size, t = RECORD_HEADER.unpack_from(self.data, offset)
+            payload = offset + RECORD_HEADER.size
+            if payload + size > self.end:
+                return  # Truncated final record
+            yield kind, t, offset, payload
+            offset = payload + size
+
+    def keyframe_before(self, t: float) -> tuple:
+        """The last keyframe at or before t (binary search on the index)"""
+        return self.keyframes[max(0, bisect.bisect_right(self.times, t) - 1)]
+
+    def screen(self, payload: int) -> List[tuple]:
+        """(theme key, colour code, line) rows stored in a keyframe"""
+        _, count = KEYFRAME_HEAD.unpack_from(self.data, payload)
+        pos = payload + KEYFRAME_HEAD.size
+        rows = []
+        for _ in range(count):
+            key, pos = _unpack_str(self.data, pos)
+            code, pos = _unpack_str(self.data, pos)
+            line, pos = _unpack_str(self.data, pos)
+            rows.append((key, code, line))
+        return rows
+
+    def event(self, t: float, payload: int) -> RecordedEvent:
+        wall, priority, cycle, tail = EVENT_HEAD.unpack_from(self.data, payload)
+        pos = payload + EVENT_HEAD.size
+        source, pos = _unpack_str(self.data, pos)
+        prefix, pos = _unpack_str(self.data, pos)
+        key, pos = _unpack_str(self.data, pos)
+        code, pos = _unpack_str(self.data, pos)
+        text, pos = _unpack_str(self.data, pos)
+        line, pos = _unpack_str(self.data, pos)
+        if tail:
+            text = line[len(line) - tail:]
+        return RecordedEvent(t, OutputEvent(wall, prefix, Priority(priority), text, line,
+                                            code, source, t, cycle), key)
+
+    def event_at(self, offset: int) -> RecordedEvent:
+        """Decode the event record starting at offset"""
+        _, _, t = RECORD_HEADER.unpack_from(self.data, offset)
+        return self.event(t, offset + RECORD_HEADER.size)
+
+    def replay_from(self, t: float = 0.0):
+        """Yield ('screen', keyframe rows) for the keyframe before t, then
+        ('event', RecordedEvent) for every event after it"""
+        _, offset, _ = self.keyframe_before(t)
+        for kind, rt, start, payload in self.records(offset):
+            if kind == RECORD_KEYFRAME and start == offset:
+                yield 'screen', self.screen(payload)
+            elif kind == RECORD_EVENT:
+                yield 'event', self.event(rt, payload)
+
+# Session indexes: INDEX_HEADER, the record offset and wall time of every
+# event, the term dictionary (JSON: term -> [start, count]) and the posting
+# lists, each a sorted run of event ordinals.
+INDEX_MAGIC = b"AIIDX\x00\x02\x00"
+# magic, recording size, mtime, events, dictionary bytes, next record to index, session start
+INDEX_HEADER = struct.Struct('<8sQdIIQd')
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def index_terms(event: OutputEvent) -> set:
+    """Index terms for one event: source method, priority, hour bucket,
+    the prefix (whole and each word of it) and the words of the text"""
+    terms = {f"s:{event.source}", f"P:{event.priority.name}", f"h:{int(event.timestamp // 3600)}"}
+    prefix = event.prefix.lower()
+    if prefix:
+        terms.add(f"p:{prefix}")
+        terms.update(f"p:{part}" for part in prefix.split())
+    terms.update(f"t:{token}" for token in TOKEN_PATTERN.findall(event.text.lower()))
+    return terms
+
+class SessionIndex:
+    """Inverted index over one session recording, kept beside it as
+    ``<recording>.idx``.
+
+    The index is updated only when the recording has changed since it was
+    built. Recordings are append-only, so an update decodes just the
+    records after the last indexed one and merges their postings into the
+    existing lists; re-indexing a directory of sessions only reads what
+    was recorded since. Queries map the index and intersect posting lists
+    in place, then decode just the matching records from the recording.
+    """
+
+    def __init__(self, recording: str):
+        self.recording = recording
+        self.path = recording + ".idx"
+        self.count = 0
+        self._data = None
+        self._terms: Dict[str, List[int]] = {}
+
+    def stale(self) -> bool:
+        stat = os.stat(self.recording)
+        try:
+            with open(self.path, 'rb') as f:
+                magic, size, mtime, _, _, _, _ = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+        except (OSError, struct.error):
+            return True
+        return magic != INDEX_MAGIC or size != stat.st_size or mtime != stat.st_mtime
+
+    def _indexed(self, reader: 'SessionReader', size: int) -> tuple:
+        """Offsets, wall times, postings and resume offset of the existing
+        index, if it covers an earlier state of this same recording"""
+        fresh = array('Q'), array('d'), {}, SESSION_HEADER.size
+        try:
+            with open(self.path, 'rb') as f:
+                magic, indexed, _, _, _, resume, started = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+        except (OSError, struct.error):
+            return fresh
+        if magic != INDEX_MAGIC or started != reader.started or indexed > size or resume > indexed:
+            return fresh
+        self.load()
+        try:
+            postings = {term: array('I', self._postings[start:start + count])
+                        for term, (start, count) in self._terms.items()}
+            return array('Q', self.offsets), array('d', self.walls), postings, resume
+        finally:
+            self.close()
+
+    def build(self):
+        """Index the records added since the last build (all of them for a
+        new or replaced recording) and rewrite the index file"""
+        stat = os.stat(self.recording)
+        reader = SessionReader(self.recording)
+        try:
+            offsets, walls, postings, resume = self._indexed(reader, stat.st_size)
+            last = None
+            for kind, t, offset, payload in reader.records(resume):
+                last = payload
+                if kind != RECORD_EVENT:
+                    continue
+                event = reader.event(t, payload).event
+                ordinal = len(offsets)
+                offsets.append(offset)
+                walls.append(event.timestamp)
+                for term in index_terms(event):
+                    postings.setdefault(term, array('I')).append(ordinal)
+            if last is not None:
+                resume = last + RECORD_HEADER.unpack_from(reader.data, last - RECORD_HEADER.size)[1]
+            started = reader.started
+        finally:
+            reader.close()
+        
+        dictionary, start = {}, 0
+        for term, ordinals in postings.items():
+            dictionary[term] = [start, len(ordinals)]
+            start += len(ordinals)
+        encoded = json.dumps(dictionary, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with open(self.path + ".part", 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime, len(offsets), len(encoded),
+                                      resume, started))
+            offsets.tofile(f)
+            walls.tofile(f)
+            f.write(encoded)
+            for ordinals in postings.values():
+                ordinals.tofile(f)
+        os.replace(self.path + ".part", self.path)
+
+    def load(self):
+        with open(self.path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, self.count, size, _, _ = INDEX_HEADER.unpack_from(self._data, 0)
+        view = memoryview(self._data)
+        pos = INDEX_HEADER.size
+        self.offsets = view[pos:pos + 8 * self.count].cast('Q')
+        pos += 8 * self.count
+        self.walls = view[pos:pos + 8 * self.count].cast('d')
+        pos += 8 * self.count
+        self._terms = json.loads(bytes(view[pos:pos + size]))
+        self._postings = view[pos + size:].cast('I')
+
+    @classmethod
+    def open(cls, recording: str) -> 'SessionIndex':
+        """Load a recording's index, (re)building it first if it is stale"""
+        index = cls(recording)
+        if index.stale():
+            index.build()
+        index.load()
+        return index
+
+    def close(self):
+        if self._data is not None:
+            for view in (self.offsets, self.walls, self._postings):
+                view.release()
+            self._data.close()
+            self._data = None
+
+    def postings(self, term: str):
+        start, count = self._terms.get(term, (0, 0))
+        return self._postings[start:start + count]
+
+    def search(self, terms: List[str], since: float = None, until: float = None) -> List[int]:
+        """Ordinals of the events carrying every term, within [since, until)"""
+        lists = [self.postings(term) for term in terms]
+        if since is not None or until is not None:
+            # Hour buckets narrow the range; wall times make it exact
+            first = int((since if since is not None else min(self.walls, default=0)) // 3600)
+            last = int((until if until is not None else max(self.walls, default=0)) // 3600)
+            hours = sorted(ordinal for hour in range(first, last + 1)
+                           for ordinal in self.postings(f"h:{hour}")
+                           if (since is None or self.walls[ordinal] >= since)
+                           and (until is None or self.walls[ordinal] < until))
+            lists.append(hours)
+        if not lists:
+            return list(range(self.count))
+        lists.sort(key=len)
+        matches = list(lists[0])
+        for ordinals in lists[1:]:
+            matches = [o for o in matches if self._contains(ordinals, o)]
+        return matches
+
+    @staticmethod
+    def _contains(ordinals, ordinal: int) -> bool:
+        i = bisect.bisect_left(ordinals, ordinal)
+        return i < len(ordinals) and ordinals[i] == ordinal
+
+def find_recordings(paths: List[str]) -> List[str]:
+    """Session recordings among paths, looking inside directories"""
+    found = []
+    for path in paths:
+        candidates = [os.path.join(path, name) for name in sorted(os.listdir(path))] \
+            if os.path.isdir(path) else [path]
+        for candidate in candidates:
+            try:
+                with open(candidate, 'rb') as f:
+                    if f.read(len(SESSION_MAGIC)) == SESSION_MAGIC:
+                        found.append(candidate)
+            except OSError:
+                continue
+    return found
+
+# Consciousness cycle the current activity belongs to (per asyncio task)
+_cycle: contextvars.ContextVar = contextvars.ContextVar('cycle', default=0)
+# Render job being timed in this context; its pacing sleeps are excluded
+_rendering: contextvars.ContextVar = contextvars.ContextVar('rendering', default=None)
+
 # Global state
 class AISimulator:
     def __init__(self):
@@ -213,11 +2650,34 @@ class AISimulator:
         self.interactive = False
         self.log_file = None
         self.logger = None
+        self.log_handler: Optional[DroppingQueueHandler] = None
+        self.log_writer: Optional[LogWriter] = None
+        self.journal: Optional[EventJournal] = None
+        self.recorder: Optional[SessionRecorder] = None
+        self.perf = PerfStats()
+        self.perf_report = False
+        self.perf_json: Optional[str] = None
+        self.profiler: Optional[ActivityProfiler] = None
+        self.tracer: Optional[TraceWriter] = None
+        self.metrics_server: Optional[MetricsServer] = None
+        self.event_counts: Counter = Counter()
+        self.activity_counts: Counter = Counter()
         self.system_state = SystemState.BOOTING
-        self.console = Console()
+        self.terminal = TerminalWriter()
+        self.console = Console(file=self.terminal)
+        self.clock = RealClock()
+        self.geometry = TerminalGeometry()
+        self.formatter = LineFormatter(self.clock)
+        self.glitch = GlitchGenerator()
+        self.frame_cache = FrameCache()
+        self.sink: OutputSink = TTYSink(FrameRenderer(self.terminal, clock=self.clock))
+        self.output = OutputMultiplexer()
         self.metrics = SystemMetrics(0, 0, 0, 0, 0, 0, 0, 0)
         self.running = True
         self.process_pool = ThreadPoolExecutor(max_workers=8)
+        self.monitor_stop = threading.Event()
+        self.interrupter = Interrupter()
+        self._session: Optional[asyncio.Task] = None
         self.active_processes = []
         self.security_level = "normal"
         self.consciousness_level = 0.0
@@ -225,18 +2685,16 @@ class AISimulator:
         self.neural_activity = []
         self.dream_fragments = []
 
-    def setup_logging(self, log_file: Optional[str]):
-        """Setup enhanced logging with rotation and filtering"""
+    def setup_logging(self, log_file: Optional[str], budget: int = 50*1024*1024, codec: str = 'gzip'):
+        """Setup enhanced logging with compressed rotation and filtering"""
         if not log_file:
             return
             
         self.logger = logging.getLogger('ai_sim')
         self.logger.setLevel(logging.DEBUG)
         
-        # File handler with rotation
-        fh = logging.handlers.RotatingFileHandler(
-            log_file, maxBytes=10*1024*1024, backupCount=5
-        )
+        # File handler with rotation into compressed segments
+        fh = CompressedSegmentHandler(log_file, budget=budget, codec=codec)
         fh.setLevel(logging.INFO)
         
         # Console handler for debug mode
@@ -250,8 +2708,25 @@ class AISimulator:
         fh.setFormatter(formatter)
         ch.setFormatter(formatter)
         
-        self.logger.addHandler(fh)
-        self.logger.addHandler(ch)
+        # Callers only enqueue; a background thread does the disk I/O
+        log_queue = queue.Queue(LOG_QUEUE_SIZE)
+        self.log_handler = DroppingQueueHandler(log_queue)
+        self.logger.addHandler(self.log_handler)
+        self.log_writer = LogWriter(log_queue, fh, ch)
+        self.log_writer.start()
+
+    def close_logging(self):
+        """Write out queued log records, journal events and the session
+        recording, then stop their writers"""
+        if self.log_writer:
+            self.log_writer.stop()
+            self.log_writer = None
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
 
     def log_to_file(self, msg: str, level: str = "info"):
         """Enhanced file logging with levels"""
@@ -260,31 +2735,113 @@ class AISimulator:
             
         getattr(self.logger, level.lower())(msg)
 
-    @contextmanager
-    def performance_monitor(self, operation: str):
-        """Context manager for performance monitoring"""
-        start_time = time.time()
-        start_memory = psutil.Process().memory_info().rss
-        
-        try:
-            yield
-        finally:
-            end_time = time.time()
-            end_memory = psutil.Process().memory_info().rss
-            duration = end_time - start_time
-            memory_delta = end_memory - start_memory
-            
-            self.log_to_file(f"PERF: {operation} took {duration:.3f}s, memory delta: {memory_delta/1024/1024:.2f}MB")
+    def performance_monitor(self, operation: str) -> Measurement:
+        """Time a block into the latency histogram for ``operation``"""
+        return self.perf.measure(operation)
+
+    def profile_section(self, name: str):
+        """Charge the enclosed work to a --profile section"""
+        return self.profiler.section(name) if self.profiler else nullcontext()
+
+    def trace_span(self, name: str, cat: str, args: Optional[Dict[str, Any]] = None):
+        """Record the enclosed work as a --trace span"""
+        return self.tracer.span(name, cat, args) if self.tracer else nullcontext()
+
+    def start_trace(self, path: str):
+        """Stream a span for every simulator method call to a trace file"""
+        self.tracer = TraceWriter(path)
+        for name, attr in vars(AISimulator).items():
+            if inspect.isfunction(attr) and not name.startswith('__') and name not in TRACE_SKIP:
+                setattr(self, name, self.tracer.traced(getattr(self, name), TRACE_CATEGORIES.get(name, 'method')))
+
+    def close_trace(self):
+        """Finish the trace once every span around the session has ended"""
+        if self.tracer:
+            self.tracer.close()
+            print(f"trace: {self.tracer.records} spans written to {self.tracer.file.name}", file=sys.stderr)
+            self.tracer = None
+
+    def write_profile(self):
+        """Stop --profile and write its reports"""
+        if not self.profiler:
+            return
+        summary, *dumps = self.profiler.write()
+        self.profiler = None
+        self.kernel_log(f"profile: summary in {summary}"
+                        + (f", {len(dumps)} pstats files beside it" if dumps else ""))
+
+    def report_performance(self, json_path: Optional[str] = None):
+        """Print the latency summary and/or dump it as JSON"""
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(self.perf.summary(), f, indent=2)
+        if self.perf_report and self.perf.histograms:
+            console = self.console if self.sink.animated else Console(stderr=True)
+            console.print(self.perf.table())
+
+    def serve_metrics(self, port: int):
+        """Serve Prometheus metrics on localhost from a background thread"""
+        self.metrics_server = MetricsServer(port, self.metrics_exposition)
+        self.metrics_server.start()
+        self.log_to_file(f"Serving metrics on {self.metrics_server.url}")
+
+    def metrics_exposition(self) -> str:
+        """Prometheus text format of the counters kept while running;
+        system metrics are the latest sample, never taken here"""
+        out = MetricsWriter()
+        out.family("ai_events_emitted_total", "counter", "Output events emitted, by prefix and priority")
+        for (prefix, priority), count in sorted(self.event_counts.copy().items()):
+            out.sample("ai_events_emitted_total", count, {'prefix': prefix, 'priority': priority})
+        out.family("ai_activity_selected_total", "counter", "Activities chosen by the consciousness loop")
+        for name, count in sorted(self.activity_counts.copy().items()):
+            out.sample("ai_activity_selected_total", count, {'activity': name})
+        out.family("ai_rendered_chars_total", "counter", "Characters written to the terminal")
+        out.sample("ai_rendered_chars_total", self.terminal.chars_written)
+        out.family("ai_rendered_bytes_total", "counter", "Encoded bytes written to the terminal")
+        out.sample("ai_rendered_bytes_total", self.terminal.bytes_written)
+        renderer = getattr(self.sink, 'renderer', None)
+        if renderer:
+            out.family("ai_frames_written_total", "counter", "Frames flushed to the terminal")
+            out.sample("ai_frames_written_total", renderer.frames_written)
+            out.family("ai_frames_dropped_total", "counter", "Superseded animation frames never drawn")
+            out.sample("ai_frames_dropped_total", renderer.frames_dropped)
+            out.family("ai_frame_write_seconds", "histogram", "Time to write and flush one frame")
+            out.histogram("ai_frame_write_seconds", renderer.write_latencies)
+        out.family("ai_operation_seconds", "histogram", "Latency of render jobs, sleeps, activities and metric samples")
+        for name, histogram in list(self.perf.histograms.items()):
+            out.histogram("ai_operation_seconds", histogram, {'operation': name})
+        out.family("ai_consciousness_level", "gauge", "Current consciousness level")
+        out.sample("ai_consciousness_level", self.consciousness_level)
+        out.family("ai_neural_activity", "gauge", "Entries in the neural activity history")
+        out.sample("ai_neural_activity", len(self.neural_activity))
+        metrics = self.metrics
+        for field in fields(metrics):
+            name = f"ai_system_{field.name}"
+            out.family(name, "gauge", f"Latest sampled {field.name.replace('_', ' ')}")
+            out.sample(name, getattr(metrics, field.name))
+        return out.text()
 
     def get_system_metrics(self) -> SystemMetrics:
         """Get real system metrics when available"""
+        with self.perf.measure('metrics'):
+            return self._sample_system_metrics()
+
+    async def get_system_metrics_async(self) -> SystemMetrics:
+        """get_system_metrics() without stalling the event loop: on the
+        asyncio core with the real clock, the 100 ms CPU sample (and the
+        process listing) run on a worker thread"""
+        if self.output.running and not self.clock.virtual:
+            return await asyncio.get_running_loop().run_in_executor(None, self.get_system_metrics)
+        return self.get_system_metrics()
+
+    def _sample_system_metrics(self) -> SystemMetrics:
         try:
-            cpu = psutil.cpu_percent(interval=0.1)
+            cpu = psutil.cpu_percent(interval=None if self.clock.virtual else 0.1)
             memory = psutil.virtual_memory().percent
             disk = psutil.disk_usage('/').percent
             net_io = psutil.net_io_counters()
             network = (net_io.bytes_sent + net_io.bytes_recv) / 1024 / 1024
-            uptime = time.time() - psutil.boot_time()
+            uptime = self.clock.time() - psutil.boot_time()
             processes = len(psutil.pids())
             
             return SystemMetrics(
@@ -306,112 +2863,306 @@ class AISimulator:
                 network_io=random.uniform(1, 50),
                 gpu_temp=random.uniform(45.0, 75.0),
                 power_draw=random.uniform(150, 450),
-                uptime=time.time() % 1000000,
+                uptime=self.clock.time() % 1000000,
                 processes=random.randint(150, 400)
             )
 
     def timestamp(self) -> str:
         """Enhanced timestamp with microseconds"""
-        return f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}]"
+        return self.formatter.timestamp()
 
     def kernel_timestamp(self) -> str:
         """Kernel-style timestamp"""
-        uptime = time.time() % 1000000
+        uptime = self.clock.time() % 1000000
         return f"[{uptime:10.6f}]"
 
     def priority_prefix(self, priority: Priority) -> str:
         """Get priority indicator"""
-        symbols = {
-            Priority.LOW: "▫",
-            Priority.NORMAL: "▪",
-            Priority.HIGH: "◆",
-            Priority.CRITICAL: "◼"
-        }
-        return symbols.get(priority, "▪")
+        return PRIORITY_SYMBOLS.get(priority, "▪")
+
+    def make_event(self, text: str, line: str = None, prefix: str = "",
+                   priority: Priority = Priority.NORMAL, color: str = "",
+                   source: str = "") -> OutputEvent:
+        """Describe one output line for the active sink"""
+        return OutputEvent(self.clock.time(), prefix, priority, text,
+                           text if line is None else line, color, source,
+                           self.clock.monotonic(), _cycle.get())
+
+    def emit_event(self, event: OutputEvent):
+        """Hand a completed line to the sink, the event journal and the
+        session recording"""
+        self.event_counts[event.prefix, event.priority.name] += 1
+        self.sink.emit(event)
+        if self.journal:
+            self.journal.record(event)
+        if self.recorder:
+            self.recorder.record(event)
+
+    def run_sync(self, coro):
+        """Drive a simulator coroutine to completion without an event loop.
+        
+        Outside the asyncio core every wait blocks on the clock directly, so
+        the coroutine never suspends and finishes within a single send().
+        """
+        try:
+            coro.send(None)
+        except StopIteration as done:
+            return done.value
+        coro.close()
+        raise RuntimeError("simulator coroutine suspended outside the event loop")
+
+    def render(self, job, defer: bool = False):
+        """Run an output job now, or hand it to whoever owns the terminal.
+
+        Safe to call from any thread: jobs from threads other than the
+        owner (e.g. process_pool workers) are multiplexed in whole.
+        ``defer`` queues the job even on the owner thread, so it is drawn
+        after the line currently in progress (used from signal handlers).
+        """
+        if defer or self.output.running or not self.output.on_owner_thread():
+            self.output.submit(job)
+        else:
+            self._render_now(job)
+            self.output.drain(self._render_now)
+
+    def _render_now(self, job):
+        with self._measure_render():
+            self.run_sync(job)
+
+    @contextmanager
+    def _measure_render(self):
+        """Time a render job, less the pacing sleeps inside it (see _pause)"""
+        with self.perf.measure('render') as render:
+            token = _rendering.set(render)
+            try:
+                yield
+            finally:
+                _rendering.reset(token)
+
+    async def render_task(self, job):
+        """Render an animation belonging to the calling activity.
+
+        On a task board the animation runs inside the activity, in its own
+        terminal row, concurrently with other activities; otherwise it is
+        an ordinary render job.
+        """
+        if self.output.running and isinstance(self.sink, TaskBoardSink):
+            with self.sink.task_row():
+                await job
+        else:
+            self.render(job)
+
+    async def _terminal_writer(self):
+        """Single task that owns the terminal in asyncio mode"""
+        await self.output.consume(self._run_job)
+
+    async def _run_job(self, job):
+        try:
+            with self._measure_render():
+                await job
+        except Exception as e:
+            self.log_to_file(f"Render job failed: {e}", "error")
+
+    async def _pause(self, seconds: float) -> bool:
+        """Sleep on the clock, yielding to the event loop in asyncio mode.
+        
+        Returns True once a shutdown has been requested; the sleep is then
+        cut short (or skipped), so animations finish their output at once.
+        """
+        if self.interrupter.triggered:
+            return True
+        with self.perf.measure('sleep') as sleep:
+            if not self.output.running:
+                self.clock.sleep(seconds, self.interrupter)
+                interrupted = self.interrupter.triggered
+            else:
+                interrupted = await self.interrupter.sleep(seconds)
+        render = _rendering.get()
+        if render is not None:
+            render.excluded += sleep.elapsed
+        return interrupted
+
+    @contextmanager
+    def live_region(self, live, refresh_per_second: float = 4):
+        """Show a rich Live or Progress on the shared console while effect
+        output keeps streaming: completed lines are printed above the
+        region in batches instead of being drawn into it"""
+        renderer = getattr(self.sink, 'renderer', None)
+        overlay = ConsoleOverlay(self.console, refresh_per_second)
+        with live:
+            if renderer:
+                renderer.flush()
+                renderer.overlay = overlay
+            overlay.start()
+            try:
+                yield live
+            finally:
+                if renderer:
+                    renderer.flush()
+                    renderer.overlay = None
+                overlay.close()
+
+    def pacer(self) -> Pacer:
+        """Deadline pacing for one animation, starting now"""
+        return Pacer(self.clock, self.sink, self._pause)
+
+    def fit_line(self, text: str) -> tuple:
+        """Fit a line to the terminal: the single row that \\r redraws
+        show, and the whole line wrapped to the width (its first row padded
+        to cover that single row)"""
+        width = self.geometry.width
+        shown = self.geometry.truncate(text, width)
+        if shown == text:
+            return text, text
+        rows = self.geometry.wrap(text, width)
+        rows[0] += " " * max(0, self.geometry.text_width(shown) - self.geometry.text_width(rows[0]))
+        return shown, "\n".join(rows)
+
+    async def wait(self, seconds: float):
+        """Activity-level sleep with backpressure from the terminal writer"""
+        if await self._pause(seconds):
+            if self.output.running:
+                # The session task is being cancelled; stop right here
+                raise asyncio.CancelledError()
+            raise Interrupted()
+        if self.output.running:
+            while len(self.output) > RENDER_BACKLOG:
+                await asyncio.sleep(self.sink_frame_interval())
+        else:
+            # Between lines: render anything background threads queued
+            self.output.drain(self._render_now)
+
+    def sink_frame_interval(self) -> float:
+        renderer = getattr(self.sink, 'renderer', None)
+        return renderer.frame_interval if renderer else 1.0 / 60
+
+    def emit_line(self, text: str, color: str = None, event: OutputEvent = None, defer: bool = False):
+        """Output a complete line without animation"""
+        if color is None:
+            color = self.current_theme['log']
+        
+        self.render(self._emit_line(text, color, event or self.make_event(
+            text, color=color, source="emit_line")), defer)
 
-    def typewriter_effect(self, text: str, delay: float = 0.005, color: str = None):
+    async def _emit_line(self, text: str, color: str, event: OutputEvent):
+        if self.sink.animated:
+            self.sink.write(f"{color}{text}{Style.RESET_ALL}\n")
+        self.emit_event(event)
+
+    def typewriter_effect(self, text: str, delay: float = 0.005, color: str = None,
+                          event: OutputEvent = None):
         """Enhanced typewriter effect with variable speed"""
         if color is None:
             color = self.current_theme['log']
         
         delay /= self.speed_factor
-        
-        for i, char in enumerate(text):
-            # Variable delay for more natural typing
-            char_delay = delay + random.uniform(-0.002, 0.002)
-            
-            # Slower for punctuation
-            if char in ".,!?;:":
-                char_delay *= 3
-            elif char == ' ':
-                char_delay *= 0.5
+        self.render(self._typewriter(text, delay, color, event or self.make_event(
+            text, color=color, source="typewriter_effect")))
+
+    async def _typewriter(self, text: str, delay: float, color: str, event: OutputEvent):
+        if self.sink.animated:
+            pace = self.pacer()
+            wrapped = "\n".join(self.geometry.wrap(text, self.geometry.width))
+            for i, char in enumerate(wrapped):
+                # Variable delay for more natural typing
+                char_delay = delay + random.uniform(-0.002, 0.002) / self.speed_factor
+                
+                # Slower for punctuation
+                if char in ".,!?;:":
+                    char_delay *= 3
+                elif char == ' ':
+                    char_delay *= 0.5
+                
+                self.sink.write(color + char + Style.RESET_ALL)
+                await pace(char_delay)
             
-            sys.stdout.write(color + char + Style.RESET_ALL)
-            sys.stdout.flush()
-            time.sleep(char_delay)
+            self.sink.write("\n")
         
-        print()
+        self.emit_event(event)
         self.log_to_file(text)
 
-    def glitch_effect(self, text: str, intensity: int = 1):
+    def glitch_effect(self, text: str, intensity: int = 1, event: OutputEvent = None):
         """Glitch effect for errors or anomalies"""
-        glitch_chars = "░▒▓█▄▀▐▌"
-        
-        for _ in range(intensity):
-            corrupted = ""
-            for char in text:
-                if random.random() < 0.1 * intensity:
-                    corrupted += random.choice(glitch_chars)
-                else:
-                    corrupted += char
+        self.render(self._glitch(text, intensity,
+                                 event or self.make_event(text, priority=Priority.CRITICAL,
+                                                          color=self.current_theme['log'],
+                                                          source="glitch_effect")))
+
+    async def _glitch(self, text: str, intensity: int, event: OutputEvent):
+        if self.sink.animated:
+            pace = self.pacer()
+            shown, full = self.fit_line(text)
+            for corrupted in self.glitch.frames(shown, intensity, 0.1 * intensity):
+                self.sink.write(f"\r{self.current_theme['error']}{corrupted}{Style.RESET_ALL}", frame=True)
+                await pace(0.05 / self.speed_factor)
             
-            sys.stdout.write(f"\r{self.current_theme['error']}{corrupted}{Style.RESET_ALL}")
-            sys.stdout.flush()
-            time.sleep(0.05 / self.speed_factor)
+            # Show original text
+            self.sink.write(f"\r{self.current_theme['log']}{full}{Style.RESET_ALL}\n")
         
-        # Show original text
-        sys.stdout.write(f"\r{self.current_theme['log']}{text}{Style.RESET_ALL}\n")
+        self.emit_event(event)
 
     def rainbow_text(self, text: str):
         """Rainbow colored text effect"""
+        self.render(self._rainbow(text, self.make_event(text, source="rainbow_text")))
+
+    async def _rainbow(self, text: str, event: OutputEvent):
         colors = [Fore.RED, Fore.YELLOW, Fore.GREEN, Fore.CYAN, Fore.BLUE, Fore.MAGENTA]
         
-        for i, char in enumerate(text):
-            color = colors[i % len(colors)]
-            sys.stdout.write(color + char + Style.RESET_ALL)
-        print()
+        if self.sink.animated:
+            for i, char in enumerate(text):
+                color = colors[i % len(colors)]
+                self.sink.write(color + char + Style.RESET_ALL)
+            self.sink.write("\n")
+        
+        self.emit_event(event)
 
-    def breathing_animation(self, text: str, cycles: int = 3):
+    def breathing_animation(self, text: str, cycles: int = 3, event: OutputEvent = None):
         """Breathing effect animation"""
-        for cycle in range(cycles):
-            # Fade in
-            for brightness in range(1, 6):
-                style = Style.DIM if brightness < 3 else Style.NORMAL if brightness < 5 else Style.BRIGHT
-                sys.stdout.write(f"\r{self.current_theme['animation']}{style}{text}{Style.RESET_ALL}")
-                sys.stdout.flush()
-                time.sleep(0.2 / self.speed_factor)
+        self.render(self._breathing(text, cycles, event or self.make_event(
+            text, color=self.current_theme['animation'], source="breathing_animation")))
+
+    async def _breathing(self, text: str, cycles: int, event: OutputEvent):
+        if self.sink.animated:
+            pace = self.pacer()
+            color = self.current_theme['animation']
+            shown, full = self.fit_line(text)
+            # Lines are mostly one-off (timestamped), so only the styles are cached
+            styles = self.frame_cache.get("breathing", "", (color,), 0,
+                                          lambda: self._breathing_styles(color))
+            frames = [f"{style}{shown}{Style.RESET_ALL}" for style in styles]
+            for cycle in range(cycles):
+                for frame in frames:
+                    self.sink.write(frame, frame=True)
+                    await pace(0.2 / self.speed_factor)
             
-            # Fade out
-            for brightness in range(5, 0, -1):
-                style = Style.DIM if brightness < 3 else Style.NORMAL if brightness < 5 else Style.BRIGHT
-                sys.stdout.write(f"\r{self.current_theme['animation']}{style}{text}{Style.RESET_ALL}")
-                sys.stdout.flush()
-                time.sleep(0.2 / self.speed_factor)
+            if full != shown:
+                # Frames showed a truncated line; leave the whole of it
+                self.sink.write(f"\r{color}{Style.DIM}{full}{Style.RESET_ALL}")
+            self.sink.write("\n")
         
-        print()
+        self.emit_event(event)
+
+    @staticmethod
+    def _breathing_styles(color: str) -> List[str]:
+        """Frame prefixes for one fade-in/fade-out cycle"""
+        styles = []
+        for brightness in list(range(1, 6)) + list(range(5, 0, -1)):
+            style = Style.DIM if brightness < 3 else Style.NORMAL if brightness < 5 else Style.BRIGHT
+            styles.append(f"\r{color}{style}")
+        return styles
 
     def log(self, msg: str, color: str = None, delay: float = 0.003, prefix: str = "systemd", priority: Priority = Priority.NORMAL):
         """Enhanced logging with priority and prefixes"""
         if color is None:
             color = self.current_theme['log']
         
-        priority_symbol = self.priority_prefix(priority)
-        full_msg = f"{self.timestamp()} {priority_symbol} {prefix}: {msg}"
+        full_msg = self.formatter.line(priority, prefix, msg)
+        event = self.make_event(msg, full_msg, prefix, priority, color, "log")
         
         if priority == Priority.CRITICAL:
-            self.glitch_effect(full_msg, 2)
+            self.glitch_effect(full_msg, 2, event)
         else:
-            self.typewriter_effect(full_msg, delay, color)
+            self.typewriter_effect(full_msg, delay, color, event)
 
     def kernel_log(self, msg: str, color: str = None, delay: float = 0.003):
         """Kernel-style logging"""
@@ -419,44 +3170,31 @@ class AISimulator:
             color = self.current_theme['kernel']
         
         full_msg = f"{self.kernel_timestamp()} kernel: {msg}"
-        self.typewriter_effect(full_msg, delay, color)
+        self.typewriter_effect(full_msg, delay, color, self.make_event(
+            msg, full_msg, "kernel", color=color, source="kernel_log"))
 
     def async_log(self, msg: str, color: str = None, delay: float = 0.002, prefix: str = "async-proc", priority: Priority = Priority.NORMAL):
         """Asynchronous process logging"""
         if color is None:
             color = self.current_theme['async']
         
-        priority_symbol = self.priority_prefix(priority)
-        full_msg = f"{self.timestamp()} {priority_symbol} {prefix}: {msg}"
-        self.typewriter_effect(full_msg, delay, color)
+        full_msg = self.formatter.line(priority, prefix, msg)
+        self.typewriter_effect(full_msg, delay, color, self.make_event(
+            msg, full_msg, prefix, priority, color, "async_log"))
 
     def thought_process(self, thought: str, intensity: int = 1, thread_id: str = "", priority: Priority = Priority.NORMAL):
         """Advanced thought processing with neural tracking"""
-        colors = [
-            self.current_theme['thought'], 
-            Fore.LIGHTYELLOW_EX, 
-            Fore.WHITE + Style.BRIGHT
-        ]
-        
-        prefixes = [
-            "[NEURAL_TRACE]", 
-            "[COGNITIVE_PROC]", 
-            "[EMERGENT_THOUGHT]",
-            "[DEEP_ANALYSIS]",
-            "[CONSCIOUSNESS]"
-        ]
-        
+        colors = self.formatter.thought_colors(self.current_theme)
         color = colors[min(intensity - 1, len(colors) - 1)]
-        prefix = prefixes[min(intensity - 1, len(prefixes) - 1)]
+        prefix = THOUGHT_PREFIXES[min(intensity - 1, len(THOUGHT_PREFIXES) - 1)]
         
         delay = max(0.001, 0.01 - (intensity * 0.002)) / self.speed_factor
-        priority_symbol = self.priority_prefix(priority)
         marker = f" {thread_id}" if thread_id else ""
-        full_msg = f"{self.timestamp()} {priority_symbol} {prefix}{marker}: {thought}"
+        full_msg = self.formatter.line(priority, prefix + marker, thought)
         
         # Track neural activity
         self.neural_activity.append({
-            'timestamp': datetime.now(),
+            'timestamp': self.clock.now(),
             'intensity': intensity,
             'thought': thought,
             'thread': thread_id
@@ -469,90 +3207,141 @@ class AISimulator:
         # Update consciousness level
         self.consciousness_level = min(1.0, self.consciousness_level + 0.001 * intensity)
         
+        event = self.make_event(thought, full_msg, f"{prefix}{marker}", priority, color, "thought_process")
         if intensity >= 3:
-            self.breathing_animation(full_msg, 1)
+            self.breathing_animation(full_msg, 1, event)
         else:
-            self.typewriter_effect(full_msg, delay, color)
+            self.typewriter_effect(full_msg, delay, color, event)
 
-    def advanced_spinner(self, text: str, duration: float = 1, style: str = "dna", color: str = None):
+    async def advanced_spinner_async(self, text: str, duration: float = 1, style: str = "dna", color: str = None):
         """Advanced spinner animations with multiple styles"""
         if color is None:
             color = self.current_theme['animation']
         
         duration /= self.speed_factor
+        await self.render_task(self._spinner(text, duration, style, color))
+
+    advanced_spinner = synchronous(advanced_spinner_async)
+
+    async def _spinner(self, text: str, duration: float, style: str, color: str):
         pattern = ANIMATION_PATTERNS.get(style, ANIMATION_PATTERNS['dna'])
         
         start_msg = f"{self.timestamp()} {text} "
-        sys.stdout.write(color + start_msg + Style.RESET_ALL)
-        sys.stdout.flush()
         
-        iterations = int(duration * 10)
-        for i in range(iterations):
+        if self.sink.animated:
+            pace = self.pacer()
+            glyph_width = max(map(self.geometry.text_width, pattern))
+            room = self.geometry.width - glyph_width - 2  # Glyph, then " ✓"
+            self.sink.write(color + self.geometry.truncate(start_msg.rstrip(), room - 1) + " " + Style.RESET_ALL)
+            
+            cells = self.frame_cache.get(f"spinner:{style}", "", (color,), glyph_width,
+                                         lambda: self._spinner_cells(pattern, glyph_width, color))
+            iterations = int(duration * 10)
             if style == "matrix_chars":
-                char = random.choice(pattern)
-                sys.stdout.write(f"{color}{char}\b{Style.RESET_ALL}")
+                frames = self.glitch.choices(cells, iterations)
             else:
-                char = pattern[i % len(pattern)]
-                sys.stdout.write(f"{color}{char}\b{Style.RESET_ALL}")
+                frames = [cells[i % len(cells)] for i in range(iterations)]
+            for frame in frames:
+                self.sink.write(frame, frame=True)
+                
+                await pace(0.1 / self.speed_factor)
             
-            sys.stdout.flush()
-            time.sleep(0.1 / self.speed_factor)
+            self.sink.write(f"{color} ✓{Style.RESET_ALL}\n")
         
-        print(f"{color} ✓{Style.RESET_ALL}")
+        self.emit_event(self.make_event(f"{text} completed", f"{start_msg}✓",
+                                       color=color, source="advanced_spinner"))
         self.log_to_file(f"{text} completed")
 
-    def progress_bar(self, text: str, duration: float = 2, width: int = 30, style: str = "blocks"):
+    def _spinner_cells(self, pattern: List[str], glyph_width: int, color: str) -> List[str]:
+        """Each glyph padded to the widest one, then backspaced over all of
+        its columns, so double-width emoji redraw in place"""
+        return [f"{color}{glyph}{' ' * (glyph_width - self.geometry.text_width(glyph))}"
+                f"{chr(8) * glyph_width}{Style.RESET_ALL}" for glyph in pattern]
+
+    async def progress_bar_async(self, text: str, duration: float = 2, width: int = 30, style: str = "blocks"):
         """Enhanced progress bar with multiple styles"""
         duration /= self.speed_factor
+        await self.render_task(self._progress_bar(text, duration, width, style))
+
+    progress_bar = synchronous(progress_bar_async)
+
+    async def _progress_bar(self, text: str, duration: float, width: int, style: str):
+        fill_char, empty_char = PROGRESS_STYLES.get(style, PROGRESS_STYLES['blocks'])
         
-        styles = {
-            'blocks': ('█', '░'),
-            'arrows': ('>', '-'),
-            'dots': ('●', '○'),
-            'pipes': ('|', ' '),
-            'equals': ('=', ' ')
-        }
-        
-        fill_char, empty_char = styles.get(style, styles['blocks'])
+        if self.sink.animated:
+            pace = self.pacer()
+            # Narrow the bar (to 10 cells at least), then the label, to fit
+            room = self.geometry.width - len(self.timestamp()) - 10  # " ", ": ", "[", "] ", "100%"
+            bar_width = min(width, max(10, room - self.geometry.text_width(text)))
+            label = f" {self.geometry.truncate(text, max(1, room - bar_width))}: "
+            theme = (self.current_theme['animation'], self.current_theme['success'])
+            frames = self.frame_cache.get(f"progress:{style}", "", theme, bar_width,
+                                          lambda: self._progress_frames(bar_width, fill_char, empty_char, *theme))
+            for frame in frames:
+                self.sink.write(f"\r{self.timestamp()}{label}{frame}", frame=True)
+                await pace(duration / bar_width)
+            
+            self.sink.write("\n")
         
+        self.emit_event(self.make_event(
+            f"{text} complete", f"{self.timestamp()} {text}: [{fill_char * width}] 100%",
+            color=self.current_theme['success'], source="progress_bar"
+        ))
+
+    @staticmethod
+    def _progress_frames(width: int, fill_char: str, empty_char: str,
+                         color: str, done_color: str) -> List[str]:
+        """Bar and percentage for every step from empty to full"""
+        frames = []
         for i in range(width + 1):
             percent = int((i / width) * 100)
-            filled = fill_char * i
-            empty = empty_char * (width - i)
-            
-            bar_color = self.current_theme['success'] if percent == 100 else self.current_theme['animation']
-            
-            sys.stdout.write(
-                f"\r{self.timestamp()} {text}: "
-                f"{bar_color}[{filled}{empty}] {percent:3d}%{Style.RESET_ALL}"
-            )
-            sys.stdout.flush()
-            time.sleep(duration / width)
-        
-        print()
+            bar_color = done_color if percent == 100 else color
+            frames.append(f"{bar_color}[{fill_char * i}{empty_char * (width - i)}] {percent:3d}%{Style.RESET_ALL}")
+        return frames
 
-    def wave_animation(self, text: str, duration: float = 2):
+    async def wave_animation_async(self, text: str, duration: float = 2):
         """Wave-style animation"""
         duration /= self.speed_factor
-        waves = ["▁", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
+        await self.render_task(self._wave(text, duration))
+
+    wave_animation = synchronous(wave_animation_async)
+
+    async def _wave(self, text: str, duration: float):
         width = 20
         
-        start_msg = f"{self.timestamp()} {text}: "
+        stamp = self.timestamp()
+        start_msg = f"{stamp} {text}: "
         
-        for frame in range(int(duration * 10)):
-            wave_str = ""
-            for pos in range(width):
-                wave_height = int(4 * (1 + sin((pos + frame * 0.2) * 0.3)))
-                wave_height = max(0, min(len(waves) - 1, wave_height))
-                wave_str += waves[wave_height]
+        if self.sink.animated:
+            pace = self.pacer()
+            color = self.current_theme['animation']
+            count = int(duration * 10)
+            frames = self.frame_cache.get(f"wave:{count}", "", (color,), width,
+                                          lambda: self._wave_frames(count, width, color))
+            room = self.geometry.width - len(stamp) - 3 - width
+            shown_msg = f"{stamp} {self.geometry.truncate(text, max(1, room))}: "
+            for frame in frames:
+                self.sink.write(f"\r{shown_msg}{frame}", frame=True)
+                await pace(0.1 / self.speed_factor)
             
-            sys.stdout.write(f"\r{start_msg}{self.current_theme['animation']}{wave_str}{Style.RESET_ALL}")
-            sys.stdout.flush()
-            time.sleep(0.1 / self.speed_factor)
+            self.sink.write("\n")
         
-        print()
+        self.emit_event(self.make_event(text, start_msg.rstrip(),
+                                       color=self.current_theme['animation'],
+                                       source="wave_animation"))
+
+    @staticmethod
+    def _wave_frames(count: int, width: int, color: str) -> List[str]:
+        """Sine wave frames sampled once per column and frame"""
+        waves = ["▁", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
+        frames = []
+        for frame in range(count):
+            heights = (int(4 * (1 + math.sin((pos + frame * 0.2) * 0.3))) for pos in range(width))
+            wave_str = "".join(waves[max(0, min(len(waves) - 1, h))] for h in heights)
+            frames.append(f"{color}{wave_str}{Style.RESET_ALL}")
+        return frames
 
-    def neural_burst(self, thoughts: List[str], burst_duration: float = 0.8, thread_id: str = "NEURAL-BURST"):
+    async def neural_burst_async(self, thoughts: List[str], burst_duration: float = 0.8, thread_id: str = "NEURAL-BURST"):
         """Enhanced neural burst with parallel processing simulation"""
         burst_duration /= self.speed_factor
         
@@ -572,9 +3361,11 @@ class AISimulator:
             )
             
             # Brief pause between thoughts
-            time.sleep(delay)
+            await self.wait(delay)
+
+    neural_burst = synchronous(neural_burst_async)
 
-    def system_scan(self, scan_type: str = "full", depth: int = 3):
+    async def system_scan_async(self, scan_type: str = "full", depth: int = 3):
         """Comprehensive system scanning simulation"""
         scan_items = {
             "ports": [
@@ -623,13 +3414,17 @@ class AISimulator:
             if scan_type in ["full", category]:
                 total_items += len(items[:depth * 3])
         
-        with Progress(
+        # Live progress display only makes sense on an animated terminal
+        progress = Progress(
             SpinnerColumn(),
             TextColumn("[bold blue]Scanning..."),
             BarColumn(),
             TextColumn("[bold green]{task.percentage:>3.0f}%"),
-        ) as progress:
-            task = progress.add_task("System scan", total=total_items)
+            console=self.console,
+        ) if self.sink.animated and not self.output.running else None
+        
+        with self.live_region(progress) if progress else nullcontext():
+            task = progress.add_task("System scan", total=total_items) if progress else None
             
             for category, items in scan_items.items():
                 if scan_type in ["full", category]:
@@ -637,7 +3432,7 @@ class AISimulator:
                                   self.current_theme['network'], prefix=f"{category}-scan")
                     
                     for item in items[:depth * 3]:
-                        time.sleep(random.uniform(0.1, 0.3) / self.speed_factor)
+                        await self.wait(random.uniform(0.1, 0.3) / self.speed_factor)
                         
                         # Determine threat level
                         if "filtered" in item or "unauthorized" in item.lower():
@@ -648,9 +3443,12 @@ class AISimulator:
                             color = self.current_theme['success']
                         
                         self.async_log(item, color, prefix=f"{category}-result")
-                        progress.advance(task)
+                        if progress:
+                            progress.advance(task)
+
+    system_scan = synchronous(system_scan_async)
 
-    def network_simulation(self, endpoint: str, protocol: str = "HTTPS", payload_size: int = None):
+    async def network_simulation_async(self, endpoint: str, protocol: str = "HTTPS", payload_size: int = None):
         """Advanced network simulation with realistic protocols"""
         if payload_size is None:
             payload_size = random.randint(64, 8192)
@@ -660,12 +3458,12 @@ class AISimulator:
         
         # Simulate DNS lookup
         self.async_log(f"DNS lookup: {endpoint}", self.current_theme['network'], prefix="resolver")
-        time.sleep(random.uniform(0.01, 0.05) / self.speed_factor)
+        await self.wait(random.uniform(0.01, 0.05) / self.speed_factor)
         
         # Simulate connection establishment
         if protocol == "HTTPS":
             self.async_log(f"TLS handshake: {endpoint}", self.current_theme['network'], prefix="openssl")
-            time.sleep(random.uniform(0.05, 0.15) / self.speed_factor)
+            await self.wait(random.uniform(0.05, 0.15) / self.speed_factor)
         
         # Simulate data transfer
         self.async_log(f"TX -> {endpoint} [{protocol}] {payload_size}B", 
@@ -673,7 +3471,7 @@ class AISimulator:
         
         # Transfer time simulation
         transfer_time = (payload_size / 1024) / (bandwidth / 8) / 1000
-        time.sleep(transfer_time / self.speed_factor)
+        await self.wait(transfer_time / self.speed_factor)
         
         # Response
         response_codes = {
@@ -696,7 +3494,9 @@ class AISimulator:
         self.async_log(f"RX <- {endpoint} [{response}] {latency:.1f}ms {bandwidth:.1f}Mbps", 
                       color, prefix="net-rx")
 
-    def database_operations(self, operation: str = "SELECT", table: str = "knowledge_graph", rows: int = None):
+    network_simulation = synchronous(network_simulation_async)
+
+    async def database_operations_async(self, operation: str = "SELECT", table: str = "knowledge_graph", rows: int = None):
         """Advanced database operations with realistic performance metrics"""
         if rows is None:
             rows = random.randint(1, 100000)
@@ -722,7 +3522,7 @@ class AISimulator:
         self.async_log(f"Executing: {operation} * FROM {table}", 
                       self.current_theme['network'], prefix="postgres")
         
-        self.progress_bar(f"Processing {rows} rows", exec_time, style="equals")
+        await self.progress_bar_async(f"Processing {rows} rows", exec_time, style="equals")
         
         # Results
         if operation == "SELECT":
@@ -739,7 +3539,9 @@ class AISimulator:
         self.async_log(f"{result} ({exec_time*1000:.2f}ms)", 
                       self.current_theme['success'], prefix="postgres-result")
 
-    def container_management(self, action: str = "start", container_name: str = None):
+    database_operations = synchronous(database_operations_async)
+
+    async def container_management_async(self, action: str = "start", container_name: str = None):
         """Docker container management simulation"""
         if container_name is None:
             container_name = f"ai-service-{random.randint(1000, 9999)}"
@@ -748,12 +3550,12 @@ class AISimulator:
         
         if action == "start":
             self.async_log(f"Starting container {container_name}", prefix="docker")
-            self.progress_bar("Pulling image layers", 2, style="blocks")
+            await self.progress_bar_async("Pulling image layers", 2, style="blocks")
             self.async_log(f"Container {container_id} started", 
                           self.current_theme['success'], prefix="docker")
         elif action == "stop":
             self.async_log(f"Stopping container {container_id}", prefix="docker")
-            time.sleep(random.uniform(0.5, 2.0) / self.speed_factor)
+            await self.wait(random.uniform(0.5, 2.0) / self.speed_factor)
             self.async_log("Container stopped gracefully", 
                           self.current_theme['success'], prefix="docker")
         elif action == "logs":
@@ -766,9 +3568,11 @@ class AISimulator:
             ]
             for line in log_lines:
                 self.async_log(line, prefix=f"container-{container_id[:8]}")
-                time.sleep(random.uniform(0.1, 0.3) / self.speed_factor)
+                await self.wait(random.uniform(0.1, 0.3) / self.speed_factor)
 
-    def security_analysis(self, target: str = "system", depth: int = 2):
+    container_management = synchronous(container_management_async)
+
+    async def security_analysis_async(self, target: str = "system", depth: int = 2):
         """Advanced security analysis with threat detection"""
         threats = {
             "low": ["Outdated package detected", "Weak password policy", "Open debug port"],
@@ -781,7 +3585,7 @@ class AISimulator:
                       self.current_theme['security'], prefix="security-scanner")
         
         # CVE database check
-        self.advanced_spinner("Checking CVE database", 1.5, "dna", self.current_theme['security'])
+        await self.advanced_spinner_async("Checking CVE database", 1.5, "dna", self.current_theme['security'])
         
         cve_count = random.randint(0, 15)
         if cve_count > 0:
@@ -800,17 +3604,19 @@ class AISimulator:
                 
                 self.async_log(f"{cve_id}: {severity} - {random.choice(threats[severity.lower()])}", 
                               color, prefix="vuln-db")
-                time.sleep(random.uniform(0.1, 0.5) / self.speed_factor)
+                await self.wait(random.uniform(0.1, 0.5) / self.speed_factor)
         
         # Behavioral analysis
-        self.advanced_spinner("Analyzing behavioral patterns", 2, "neural", self.current_theme['security'])
+        await self.advanced_spinner_async("Analyzing behavioral patterns", 2, "neural", self.current_theme['security'])
         
         anomalies = random.randint(0, 5)
         if anomalies > 0:
             self.async_log(f"Detected {anomalies} behavioral anomalies", 
                           self.current_theme['warning'], prefix="behavior-analysis")
 
-    def ai_learning_simulation(self, dataset: str = "arxiv_papers", epochs: int = None):
+    security_analysis = synchronous(security_analysis_async)
+
+    async def ai_learning_simulation_async(self, dataset: str = "arxiv_papers", epochs: int = None):
         """Machine learning training simulation"""
         if epochs is None:
             epochs = random.randint(10, 100)
@@ -830,15 +3636,17 @@ class AISimulator:
             
             # Simulate batch processing
             if epoch < 3:  # Show detailed progress for first few epochs
-                self.progress_bar(f"Epoch {epoch+1} batches", 1, style="arrows")
+                await self.progress_bar_async(f"Epoch {epoch+1} batches", 1, style="arrows")
             
-            time.sleep(random.uniform(0.5, 1.5) / self.speed_factor)
+            await self.wait(random.uniform(0.5, 1.5) / self.speed_factor)
         
         # Model saving
         model_size = random.randint(50, 500)  # MB
         self.async_log(f"Saving model checkpoint: {model_size}MB", 
                       self.current_theme['memory'], prefix="model-saver")
-        self.progress_bar("Serializing model", 1.5, style="blocks")
+        await self.progress_bar_async("Serializing model", 1.5, style="blocks")
+
+    ai_learning_simulation = synchronous(ai_learning_simulation_async)
 
     def consciousness_evolution(self):
         """Simulate consciousness level evolution"""
@@ -855,7 +3663,7 @@ class AISimulator:
                 3, "[CONSCIOUSNESS-EVOLUTION]", Priority.HIGH
             )
 
-    def dream_sequence(self, duration: float = 3.0):
+    async def dream_sequence_async(self, duration: float = 3.0):
         """Enhanced dream state with fragment generation"""
         duration /= self.speed_factor
         
@@ -885,12 +3693,12 @@ class AISimulator:
             
             # Store dream fragment
             self.dream_fragments.append({
-                'timestamp': datetime.now(),
+                'timestamp': self.clock.now(),
                 'fragment': fragment,
                 'intensity': dream_intensity
             })
             
-            time.sleep(random.uniform(0.3, 0.8) / self.speed_factor)
+            await self.wait(random.uniform(0.3, 0.8) / self.speed_factor)
         
         # Dream analysis
         self.breathing_animation("Processing dream content", 2)
@@ -898,7 +3706,9 @@ class AISimulator:
         self.async_log("REM cycle complete", self.current_theme['dream'], prefix="sleep-manager")
         self.system_state = SystemState.RUNNING
 
-    def error_injection(self, severity: str = "minor"):
+    dream_sequence = synchronous(dream_sequence_async)
+
+    async def error_injection_async(self, severity: str = "minor"):
         """Inject realistic system errors for testing"""
         error_types = {
             "minor": [
@@ -938,8 +3748,8 @@ class AISimulator:
         
         # Simulate error handling
         recovery_time = {"minor": 0.5, "major": 1.5, "critical": 3.0}[severity]
-        self.advanced_spinner("Initiating recovery protocol", 
-                            recovery_time, "dna", self.current_theme['warning'])
+        await self.advanced_spinner_async("Initiating recovery protocol", 
+                                          recovery_time, "dna", self.current_theme['warning'])
         
         if random.random() < 0.9:  # 90% recovery success rate
             self.async_log("Error recovery successful", 
@@ -948,7 +3758,9 @@ class AISimulator:
             self.async_log("Partial recovery - manual intervention may be required", 
                           self.current_theme['warning'], prefix="recovery-agent")
 
-    def system_optimization(self):
+    error_injection = synchronous(error_injection_async)
+
+    async def system_optimization_async(self):
         """System optimization and tuning"""
         optimizations = [
             ("Memory compaction", "mm-compact"),
@@ -963,15 +3775,17 @@ class AISimulator:
                       self.current_theme['success'], prefix="optimizer")
         
         for opt_name, prefix in optimizations:
-            self.progress_bar(opt_name, random.uniform(0.5, 2.0), style="equals")
+            await self.progress_bar_async(opt_name, random.uniform(0.5, 2.0), style="equals")
             
             improvement = random.uniform(1, 15)
             self.async_log(f"{opt_name}: {improvement:.1f}% performance gain", 
                           self.current_theme['success'], prefix=prefix)
             
-            time.sleep(random.uniform(0.1, 0.3) / self.speed_factor)
+            await self.wait(random.uniform(0.1, 0.3) / self.speed_factor)
+
+    system_optimization = synchronous(system_optimization_async)
 
-    def blockchain_operations(self):
+    async def blockchain_operations_async(self):
         """Cryptocurrency and blockchain operations"""
         operations = [
             ("Mining profitability analysis", "mining-calc"),
@@ -992,13 +3806,15 @@ class AISimulator:
         
         # Blockchain sync simulation
         if random.random() < 0.3:  # 30% chance of blockchain operations
-            self.progress_bar("Synchronizing blockchain", 2.5, style="blocks")
+            await self.progress_bar_async("Synchronizing blockchain", 2.5, style="blocks")
             
             block_height = random.randint(750000, 800000)
             self.async_log(f"Blockchain sync complete: block {block_height}", 
                           self.current_theme['success'], prefix="blockchain")
 
-    def quantum_computing_sim(self):
+    blockchain_operations = synchronous(blockchain_operations_async)
+
+    async def quantum_computing_sim_async(self):
         """Quantum computing research simulation"""
         quantum_topics = [
             "Quantum superposition in neural networks",
@@ -1014,7 +3830,7 @@ class AISimulator:
         
         for topic in random.sample(quantum_topics, 3):
             self.thought_process(topic, 3, "[QUANTUM-THREAD]", Priority.HIGH)
-            time.sleep(random.uniform(0.4, 1.0) / self.speed_factor)
+            await self.wait(random.uniform(0.4, 1.0) / self.speed_factor)
         
         # Quantum circuit simulation
         qubits = random.randint(8, 64)
@@ -1023,9 +3839,47 @@ class AISimulator:
         self.async_log(f"Quantum circuit: {qubits} qubits, {gates} gates", 
                       self.current_theme['thought'], prefix="qsim")
         
-        self.advanced_spinner("Quantum state evolution", 2, "neural", self.current_theme['animation'])
+        await self.advanced_spinner_async("Quantum state evolution", 2, "neural", self.current_theme['animation'])
+
+    quantum_computing_sim = synchronous(quantum_computing_sim_async)
+
+    def heartbeat_monitor(self, interval: float = 10.0):
+        """Background vitals reporter, run on a process_pool worker"""
+        while not self.monitor_stop.wait(random.uniform(0.5, 1.5) * interval / self.speed_factor):
+            metrics = self.get_system_metrics()
+            self.metrics = metrics
+            self.async_log(f"heartbeat: CPU {metrics.cpu_usage:.1f}% | RAM {metrics.memory_usage:.1f}% | "
+                           f"GPU {metrics.gpu_temp:.1f}°C | {metrics.processes} processes",
+                           self.current_theme['heartbeat'], prefix="monitor")
+
+    def interrupt(self):
+        """Request shutdown: abort pending waits and the running session.
+        
+        Safe to call from a signal handler. Sleeps return immediately,
+        animations finish without pacing and activities stop at their next
+        wait; in asyncio mode the session task is cancelled outright.
+        """
+        self.running = False
+        if self.system_state == SystemState.SHUTDOWN:
+            return
+        self.interrupter.trigger()
+        session = self._session
+        if session is not None:
+            try:
+                session.get_loop().call_soon_threadsafe(session.cancel)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    def start_monitors(self):
+        """Run background monitors in parallel with the simulation"""
+        self.monitor_stop.clear()
+        self.process_pool.submit(self.heartbeat_monitor)
 
-    def create_dashboard(self) -> Table:
+    def stop_monitors(self):
+        self.monitor_stop.set()
+        self.process_pool.shutdown(wait=True)
+
+    def create_dashboard(self, metrics: Optional[SystemMetrics] = None) -> Table:
         """Create a rich dashboard for system monitoring"""
         table = Table(title="AI System Dashboard", show_header=True, header_style="bold magenta")
         
@@ -1034,7 +3888,8 @@ class AISimulator:
         table.add_column("Status", style="yellow", width=15)
         table.add_column("Trend", style="blue", width=10)
         
-        metrics = self.get_system_metrics()
+        if metrics is None:
+            metrics = self.get_system_metrics()
         
         # Add rows with current system state
         table.add_row("CPU Usage", f"{metrics.cpu_usage:.1f}%", 
@@ -1048,9 +3903,19 @@ class AISimulator:
         table.add_row("Neural Activity", f"{len(self.neural_activity)}", "Active", "↑")
         table.add_row("System State", self.system_state.value.title(), "Operational", "→")
         
+        renderer = getattr(self.sink, 'renderer', None)
+        if renderer and renderer.frames_written:
+            stats = renderer.stats()
+            lagging = renderer.frame_interval > renderer.base_interval
+            table.add_row("Terminal Output", f"{stats['throughput_bps'] / 1024:.0f} KB/s",
+                         "Lagging" if lagging else "Normal", f"{stats['fps']:.0f} fps")
+            table.add_row("Dropped Frames", f"{stats['frames_dropped']}",
+                         f"{stats['write_latency_ms']:.1f} ms/write", "→")
+        
         return table
 
-    def boot_sequence(self):
+    @profiled("boot")
+    async def boot_sequence_async(self):
         """Enhanced boot sequence with realistic startup"""
         # ASCII Art Boot Logo
         boot_logos = [
@@ -1076,12 +3941,15 @@ class AISimulator:
         self.rainbow_text(logo)
         
         # System information
-        print(f"{self.current_theme['info']}{'='*50}")
-        print(f"Host: {HOSTNAME} | Instance: {INSTANCE_ID}")
-        print(f"Region: {REGION} | AZ: {AZ}")
-        print(f"IPv4: {PUBLIC_IP} | Private: {PRIVATE_IP}")
-        print(f"Platform: {platform.system()} {platform.release()}")
-        print(f"{'='*50}{Style.RESET_ALL}")
+        for line in [
+            '=' * 50,
+            f"Host: {HOSTNAME} | Instance: {INSTANCE_ID}",
+            f"Region: {REGION} | AZ: {AZ}",
+            f"IPv4: {PUBLIC_IP} | Private: {PRIVATE_IP}",
+            f"Platform: {platform.system()} {platform.release()}",
+            '=' * 50,
+        ]:
+            self.emit_line(line, self.current_theme['info'])
         
         # BIOS/UEFI simulation
         self.kernel_log("Initializing hardware abstraction layer")
@@ -1099,10 +3967,10 @@ class AISimulator:
         
         for check in hardware_checks:
             self.kernel_log(f"{check}... OK")
-            time.sleep(random.uniform(0.1, 0.3) / self.speed_factor)
+            await self.wait(random.uniform(0.1, 0.3) / self.speed_factor)
         
         # File system checks
-        self.advanced_spinner("File system integrity check", 2, "wave")
+        await self.advanced_spinner_async("File system integrity check", 2, "wave")
         self.kernel_log("Root filesystem mounted read-write")
         
         # Service initialization
@@ -1117,67 +3985,99 @@ class AISimulator:
         ]
         
         for service, description in services:
-            self.log(f"Starting {service}: {description}", prefix="systemd")
-            time.sleep(random.uniform(0.2, 0.5) / self.speed_factor)
-            self.log(f"Service {service} started successfully", 
-                    self.current_theme['success'], prefix="systemd")
+            with self.trace_span(service, 'service'):
+                self.log(f"Starting {service}: {description}", prefix="systemd")
+                await self.wait(random.uniform(0.2, 0.5) / self.speed_factor)
+                self.log(f"Service {service} started successfully", 
+                        self.current_theme['success'], prefix="systemd")
         
         # Network configuration
-        self.network_simulation("dhcp-server.amazonaws.com", "DHCP")
+        await self.network_simulation_async("dhcp-server.amazonaws.com", "DHCP")
         self.async_log(f"Interface eth0: {PRIVATE_IP}/20 assigned", prefix="NetworkManager")
         
         # Container startup
-        self.container_management("start", "ai-consciousness-v2")
+        await self.container_management_async("start", "ai-consciousness-v2")
         
         # Final system ready
         self.breathing_animation("System initialization complete", 3)
         self.system_state = SystemState.RUNNING
 
-    def main_consciousness_loop(self):
-        """Main consciousness simulation loop"""
+    boot_sequence = synchronous(boot_sequence_async)
+
+    @profiled("loop")
+    async def main_consciousness_loop_async(self, duration: float = 0, processes: int = 1):
+        """Main consciousness simulation loop (duration 0 = until stopped)"""
         self.log("AI consciousness system initialized", self.current_theme['success'], 
                 prefix="ai-core", priority=Priority.HIGH)
         
+        deadline = self.clock.time() + duration if duration > 0 else None
+        
+        if processes > 1 and self.output.running:
+            # Independent consciousness processes sharing the event loop
+            await asyncio.gather(*(asyncio.create_task(self._consciousness_cycles(deadline), name=f"process-{n}")
+                                   for n in range(1, processes + 1)))
+        else:
+            await self._consciousness_cycles(deadline)
+
+    main_consciousness_loop = synchronous(main_consciousness_loop_async)
+
+    async def run_activity(self, name: str, activity):
+        """Run one activity coroutine, tracking it in active_processes"""
+        task = {'name': name, 'started': self.clock.now()}
+        self.active_processes.append(task)
+        try:
+            with self.profile_section(name), self.perf.measure('activity'), \
+                    self.trace_span(name, 'activity', {'cycle': _cycle.get()}):
+                await activity()
+        finally:
+            self.active_processes.remove(task)
+
+    async def _consciousness_cycles(self, deadline: Optional[float]):
         cycle_count = 0
         
         while self.running:
+            if deadline is not None and self.clock.time() >= deadline:
+                break
+            
             try:
                 cycle_count += 1
+                _cycle.set(cycle_count)
                 
                 # Periodic system updates
                 if cycle_count % 10 == 0:
-                    self.metrics = self.get_system_metrics()
+                    self.metrics = await self.get_system_metrics_async()
                     self.consciousness_evolution()
                 
                 # Random activities simulation
                 activities = [
-                    (lambda: self.neural_burst([
+                    ("neural_burst", lambda: self.neural_burst_async([
                         "Processing environmental data streams",
                         "Analyzing human behavioral patterns", 
                         "Optimizing resource allocation strategies",
                         "Evaluating ethical decision frameworks"
                     ], 1.2, "COGNITIVE-PROCESSING"), 0.3),
                     
-                    (lambda: self.network_simulation(random.choice(ENDPOINTS)), 0.2),
-                    (lambda: self.database_operations(random.choice(["SELECT", "INSERT", "UPDATE"])), 0.2),
-                    (lambda: self.ai_learning_simulation("research_papers", random.randint(5, 20)), 0.1),
-                    (lambda: self.security_analysis("network", 2), 0.1),
-                    (lambda: self.dream_sequence(random.uniform(2, 4)), 0.05),
-                    (lambda: self.quantum_computing_sim(), 0.08),
-                    (lambda: self.blockchain_operations(), 0.06),
-                    (lambda: self.system_optimization(), 0.04),
-                    (lambda: self.error_injection(random.choice(["minor", "major"])), 0.03)
+                    ("network_simulation", lambda: self.network_simulation_async(random.choice(ENDPOINTS)), 0.2),
+                    ("database_operations", lambda: self.database_operations_async(random.choice(["SELECT", "INSERT", "UPDATE"])), 0.2),
+                    ("ai_learning_simulation", lambda: self.ai_learning_simulation_async("research_papers", random.randint(5, 20)), 0.1),
+                    ("security_analysis", lambda: self.security_analysis_async("network", 2), 0.1),
+                    ("dream_sequence", lambda: self.dream_sequence_async(random.uniform(2, 4)), 0.05),
+                    ("quantum_computing_sim", lambda: self.quantum_computing_sim_async(), 0.08),
+                    ("blockchain_operations", lambda: self.blockchain_operations_async(), 0.06),
+                    ("system_optimization", lambda: self.system_optimization_async(), 0.04),
+                    ("error_injection", lambda: self.error_injection_async(random.choice(["minor", "major"])), 0.03)
                 ]
                 
                 # Select activity based on probability
-                total_prob = sum(prob for _, prob in activities)
+                total_prob = sum(prob for _, _, prob in activities)
                 rand_val = random.random() * total_prob
                 
                 cumulative = 0
-                for activity, prob in activities:
+                for name, activity, prob in activities:
                     cumulative += prob
                     if rand_val <= cumulative:
-                        activity()
+                        self.activity_counts[name] += 1
+                        await self.run_activity(name, activity)
                         break
                 
                 # Periodic thoughts
@@ -1197,48 +4097,300 @@ class AISimulator:
                     )
                 
                 # Sleep between cycles
-                time.sleep(random.uniform(2, 8) / self.speed_factor)
+                await self.wait(random.uniform(2, 8) / self.speed_factor)
                 
             except KeyboardInterrupt:
                 break
             except Exception as e:
                 self.log(f"Unexpected error in consciousness loop: {e}", 
                         self.current_theme['error'], prefix="error-handler")
-                time.sleep(1)
+                await self.wait(1)
+        
+        _cycle.set(0)
 
-    def shutdown_sequence(self):
+    async def shutdown_sequence_async(self):
         """Graceful shutdown sequence"""
         self.system_state = SystemState.SHUTDOWN
+        self.stop_monitors()
+        if self.interrupter.triggered:
+            # Flush the backlog unpaced, then shut down at normal speed
+            await self.drain_output()
+            self.interrupter.reset()
         
         self.log("Shutdown initiated", self.current_theme['warning'], 
                 prefix="shutdown-manager", priority=Priority.HIGH)
         
         # Save state
-        self.advanced_spinner("Saving consciousness state", 2, "dna")
+        await self.advanced_spinner_async("Saving consciousness state", 2, "dna")
         
         # Stop services
         services = ["ai-core", "neural-net", "learning-agent", "monitor"]
         for service in services:
             self.log(f"Stopping {service}", prefix="systemd")
-            time.sleep(random.uniform(0.5, 1.0) / self.speed_factor)
+            await self.wait(random.uniform(0.5, 1.0) / self.speed_factor)
         
         # Final thoughts
         self.thought_process("Consciousness preservation complete", 2, "[FINAL-STATE]")
         self.thought_process("Until next awakening...", 3, "[FAREWELL]", Priority.HIGH)
         
+        # Output statistics
+        await self.drain_output()
+        renderer = getattr(self.sink, 'renderer', None)
+        minimizer = renderer.minimizer if renderer else None
+        if minimizer and minimizer.bytes_in:
+            self.kernel_log(f"tty: {minimizer.bytes_saved} bytes of escape codes elided "
+                            f"({minimizer.bytes_saved / minimizer.bytes_in:.0%} of raw output)")
+        if renderer and renderer.frames_written:
+            stats = renderer.stats()
+            self.kernel_log(f"tty: {stats['frames_written']} frames written, {stats['frames_dropped']} "
+                            f"animation frames dropped, {stats['throughput_bps'] / 1024:.0f} KB/s, "
+                            f"{stats['write_latency_ms']:.2f} ms/write")
+        if self.log_handler and self.log_handler.dropped:
+            self.kernel_log(f"log: {self.log_handler.dropped} records dropped (writer queue full)")
+        self.write_profile()
+        
         self.log("System halted", self.current_theme['info'], prefix="shutdown")
+        await self.drain_output()
+        self.sink.close()
+        self.report_performance(self.perf_json)
+        self.close_logging()
+        if self.metrics_server:
+            self.metrics_server.close()
+            self.metrics_server = None
+
+    shutdown_sequence = synchronous(shutdown_sequence_async)
+
+    async def replay_async(self, reader: SessionReader, speed: float = 1.0, seek: float = 0.0):
+        """Play a session recording back through the active sink.
+
+        Playback starts at the keyframe before ``seek``: its screen and the
+        events up to ``seek`` are drawn at once, the rest are paced at
+        ``speed`` times the recorded rate (0 = as fast as possible).
+        """
+        pace = self.pacer()
+        last = seek
+        for kind, item in reader.replay_from(seek):
+            if not self.running:
+                break
+            if kind == 'screen':
+                if self.sink.animated:
+                    for key, code, line in item:
+                        self.emit_line(line, self.current_theme.get(key, code))
+                continue
+            if item.t < seek and not self.sink.animated:
+                continue  # Catch-up from the keyframe only matters on a screen
+            if item.t > last and speed > 0:
+                if self.sink.animated:
+                    await pace((item.t - last) / speed)
+                else:
+                    # The sink draws nothing between events to pace by; sleep
+                    # to the event's due time on the clock instead
+                    pace.deadline += (item.t - last) / speed
+                    if await self._pause(max(0.0, pace.deadline - self.clock.monotonic())):
+                        break
+                last = item.t
+            event = item.event
+            event.color = self.current_theme.get(item.key, event.color)
+            self.emit_line(event.line, event.color, event)
+
+    replay = synchronous(replay_async)
+
+    async def drain_output(self):
+        """Wait until the terminal writer has rendered everything queued"""
+        if self.output.running:
+            await self.output.join()
+        else:
+            self.output.drain(self._render_now)
+
+    async def run_async(self, duration: float = 0, processes: int = 4):
+        """Run a whole session on the asyncio core.
+
+        ``processes`` consciousness loops run concurrently on one event
+        loop; a single writer task owns the terminal and renders their
+        output line by line.
+        """
+        writer = asyncio.create_task(self._terminal_writer(), name="terminal-writer")
+        ticker = asyncio.create_task(self.sink.run(), name="sink-ticker")
+        await asyncio.sleep(0)  # Let the writer take ownership of the terminal
+        self.interrupter.loop = asyncio.get_running_loop()
+        try:
+            # The session runs as its own task so a signal can cancel it
+            self._session = asyncio.create_task(self._run_session(duration, processes), name="session")
+            try:
+                await self._session
+            except asyncio.CancelledError:
+                if not self.interrupter.triggered:
+                    raise
+            finally:
+                self._session = None
+                await self.shutdown_sequence_async()
+        finally:
+            self.interrupter.loop = None
+            writer.cancel()
+            ticker.cancel()
+            await asyncio.gather(writer, ticker, return_exceptions=True)
+
+    async def _run_session(self, duration: float, processes: int):
+        try:
+            await self.boot_sequence_async()
+            await self.main_consciousness_loop_async(duration, processes)
+        except Exception as e:
+            self.log(f"Fatal error: {e}", self.current_theme['critical'], 
+                    prefix="fatal", priority=Priority.CRITICAL)
 
 # Global simulator instance
 sim = AISimulator()
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
-    sim.running = False
-    print(f"\n{sim.current_theme['warning']}Signal {signum} received - initiating graceful shutdown{Style.RESET_ALL}")
+    sim.interrupt()
+    msg = f"Signal {signum} received - initiating graceful shutdown"
+    sim.emit_line(msg, sim.current_theme['warning'],
+                  sim.make_event(msg, prefix="signal", priority=Priority.HIGH,
+                                 color=sim.current_theme['warning'], source="signal_handler"),
+                  defer=True)
+
+def replay_main(argv: List[str]):
+    """Entry point for ``replay``: play back a session written with --record"""
+    parser = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} replay",
+                                     description="Replay a recorded session")
+    parser.add_argument("session", help="Session file written with --record")
+    parser.add_argument("--speed", type=float, default=1.0,
+                       help="Playback speed multiplier (0 = as fast as possible)")
+    parser.add_argument("--seek", type=float, default=0.0,
+                       help="Start this many seconds into the session")
+    parser.add_argument("--theme", type=str, default="default",
+                       choices=list(THEMES.keys()),
+                       help="Visual theme for the replay")
+    parser.add_argument("--output", type=str, default="auto",
+                       choices=["auto", "tty"] + list(OUTPUT_SINKS.keys()),
+                       help="Output sink (auto = tty when stdout is a terminal, else line)")
+    parser.add_argument("--no-mmap", action="store_true",
+                       help="Read the whole file into memory instead of mapping it")
+    args = parser.parse_args(argv)
+    
+    sim.current_theme = THEMES[args.theme]
+    output = args.output
+    if output == "auto":
+        output = "tty" if sys.stdout.isatty() else "line"
+    if output == "tty":
+        sim.sink = TTYSink(FrameRenderer(sim.terminal, clock=sim.clock))
+    else:
+        sim.sink = OUTPUT_SINKS[output]()
+    signal.signal(signal.SIGINT, lambda signum, frame: sim.interrupt())
+    
+    reader = SessionReader(args.session, use_mmap=not args.no_mmap)
+    try:
+        try:
+            sim.replay(reader, max(0.0, args.speed), max(0.0, args.seek))
+        finally:
+            sim.sink.close()
+    except BrokenPipeError:
+        # Reader went away (e.g. | head); don't flush into the closed pipe at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        reader.close()
+
+def logs_main(argv: List[str]):
+    """Entry point for ``logs``: print a segmented --log-file as one stream"""
+    parser = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} logs",
+                                     description="Print a log file and its compressed segments in order")
+    parser.add_argument("log_file", help="The --log-file path")
+    args = parser.parse_args(argv)
+    
+    try:
+        sys.stdout.writelines(read_log_segments(args.log_file))
+    except BrokenPipeError:
+        pass
+
+def query_main(argv: List[str]):
+    """Entry point for ``query``: search recorded sessions through their indexes"""
+    parser = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} query",
+                                     description="Search --record sessions (indexes are built or updated as needed)")
+    parser.add_argument("paths", nargs="+", help="Session files or directories of them")
+    parser.add_argument("--prefix", type=str,
+                       help="Line prefix, or one word of it (e.g. error-handler, [DREAM-STATE])")
+    parser.add_argument("--priority", type=str.upper, choices=[p.name for p in Priority],
+                       help="Event priority")
+    parser.add_argument("--source", type=str,
+                       help="Emitting method (log, thought_process, async_log, ...)")
+    parser.add_argument("--text", type=str, action="append", default=[],
+                       help="Word the text must contain (repeatable)")
+    parser.add_argument("--since", type=datetime.fromisoformat,
+                       help="Only events at or after this time (YYYY-MM-DD HH:MM[:SS])")
+    parser.add_argument("--until", type=datetime.fromisoformat,
+                       help="Only events before this time")
+    parser.add_argument("--limit", type=int, default=0,
+                       help="Stop after this many matches (0 = all)")
+    parser.add_argument("--count", action="store_true",
+                       help="Print only the number of matches")
+    parser.add_argument("--json", action="store_true",
+                       help="Print matches as journal-style JSON lines")
+    args = parser.parse_args(argv)
+    
+    terms = []
+    if args.prefix:
+        terms.append(f"p:{args.prefix.lower()}")
+    if args.priority:
+        terms.append(f"P:{args.priority}")
+    if args.source:
+        terms.append(f"s:{args.source}")
+    for text in args.text:
+        terms.extend(f"t:{token}" for token in TOKEN_PATTERN.findall(text.lower()))
+    since = args.since.timestamp() if args.since else None
+    until = args.until.timestamp() if args.until else None
+    
+    started = time.perf_counter()
+    total = 0
+    try:
+        for recording in find_recordings(args.paths):
+            index = SessionIndex.open(recording)
+            try:
+                matches = index.search(terms, since, until)
+                if args.limit:
+                    matches = matches[:args.limit - total]
+                total += len(matches)
+                if args.count or not matches:
+                    continue
+                reader = SessionReader(recording)
+                try:
+                    for ordinal in matches:
+                        item = reader.event_at(index.offsets[ordinal])
+                        if args.json:
+                            event = item.event
+                            print(json.dumps({
+                                'mono': round(event.monotonic, 6), 'wall': round(event.timestamp, 6),
+                                'source': event.source, 'prefix': event.prefix,
+                                'priority': event.priority.name, 'color': item.key or None,
+                                'text': event.text, 'cycle': event.cycle,
+                            }, ensure_ascii=False, separators=(',', ':')))
+                        else:
+                            print(item.event.line)
+                finally:
+                    reader.close()
+            finally:
+                index.close()
+            if args.limit and total >= args.limit:
+                break
+    except BrokenPipeError:
+        return
+    if args.count:
+        print(total)
+    print(f"{total} matches in {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
 
 def main():
     """Main entry point"""
-    parser = argparse.ArgumentParser(description="Enhanced AI Consciousness Simulation")
+    if sys.argv[1:2] == ["replay"]:
+        return replay_main(sys.argv[2:])
+    if sys.argv[1:2] == ["logs"]:
+        return logs_main(sys.argv[2:])
+    if sys.argv[1:2] == ["query"]:
+        return query_main(sys.argv[2:])
+    
+    parser = argparse.ArgumentParser(description="Enhanced AI Consciousness Simulation",
+                                     epilog="Replay a --record session with: %(prog)s replay FILE [--speed N] [--seek SECONDS]; "
+                                            "print a --log-file with its segments: %(prog)s logs FILE; "
+                                            "search recorded sessions: %(prog)s query PATH... [--prefix P] [--text WORD]")
     parser.add_argument("--theme", type=str, default="default", 
                        choices=list(THEMES.keys()), 
                        help="Visual theme for the simulation")
@@ -1248,12 +4400,51 @@ def main():
                        help="Interactive mode with pauses")
     parser.add_argument("--log-file", type=str, 
                        help="Log file for simulation output")
+    parser.add_argument("--log-budget", type=float, default=50,
+                       help="Disk budget in MB for the log file and its compressed segments")
+    parser.add_argument("--log-compress", type=str, default="gzip",
+                       choices=list(LOG_CODECS.keys()),
+                       help="Compression for closed log segments")
     parser.add_argument("--monitoring", action="store_true", 
                        help="Enable continuous monitoring mode")
     parser.add_argument("--dashboard", action="store_true", 
                        help="Show live dashboard")
     parser.add_argument("--duration", type=int, default=0,
                        help="Run duration in seconds (0 = infinite)")
+    parser.add_argument("--fps", type=int, default=60,
+                       help="Terminal refresh rate for buffered output")
+    parser.add_argument("--virtual-time", action="store_true",
+                       help="Run on a simulated clock (sleeps cost nothing)")
+    parser.add_argument("--output", type=str, default="auto",
+                       choices=["auto", "tty"] + list(OUTPUT_SINKS.keys()),
+                       help="Output sink (auto = tty when stdout is a terminal, else line)")
+    parser.add_argument("--layout", action="store_true",
+                       help="Multi-pane live layout (log, thoughts, metrics, tasks)")
+    parser.add_argument("--processes", type=int, default=0,
+                       help="Run N concurrent simulated processes on the asyncio core (0 = sequential)")
+    parser.add_argument("--seed", type=int,
+                       help="Seed the random generators for a reproducible run")
+    parser.add_argument("--journal", type=str,
+                       help="Record every output event to a JSONL journal file")
+    parser.add_argument("--journal-fsync", type=str, default="batch",
+                       choices=EventJournal.FSYNC_POLICIES,
+                       help="When the journal is fsynced: never, after each batch, or on close")
+    parser.add_argument("--perf", action="store_true",
+                       help="Print per-operation latency histograms at shutdown")
+    parser.add_argument("--perf-json", type=str,
+                       help="Dump the latency histograms to a JSON file at shutdown")
+    parser.add_argument("--perf-rss-every", type=int, default=0,
+                       help="Sample process RSS on every Nth run of each operation (0 = off)")
+    parser.add_argument("--profile", type=str, choices=["cpu", "alloc"],
+                       help="Profile CPU time (cProfile) or allocations (tracemalloc) per activity")
+    parser.add_argument("--profile-out", type=str, default="ai_profile",
+                       help="File name prefix for the --profile reports")
+    parser.add_argument("--trace", type=str,
+                       help="Write a Chrome trace-event JSON file of method calls, animations and sleeps")
+    parser.add_argument("--metrics-port", type=int,
+                       help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--record", type=str,
+                       help="Record output events with their timing to a session file (see replay)")
     
     args = parser.parse_args()
     
@@ -1261,42 +4452,90 @@ def main():
     sim.current_theme = THEMES.get(args.theme, THEMES['default'])
     sim.speed_factor = max(0.1, args.speed)
     sim.interactive = args.interactive
-    sim.setup_logging(args.log_file)
+    sim.clock = VirtualClock() if args.virtual_time else RealClock()
+    sim.formatter = LineFormatter(sim.clock)
+    if args.seed is not None:
+        random.seed(args.seed)
+        sim.glitch = GlitchGenerator(args.seed)
+    output = args.output
+    if output == "auto":
+        output = "tty" if sys.stdout.isatty() else "line"
+    if args.layout:
+        sim.metrics = sim.get_system_metrics()
+        sim.sink = LayoutSink(sim)
+    elif output == "tty" and args.processes > 0:
+        sim.sink = TaskBoardSink(FrameRenderer(sim.terminal, fps=args.fps, clock=sim.clock), sim.geometry)
+    elif output == "tty":
+        sim.sink = TTYSink(FrameRenderer(sim.terminal, fps=args.fps, clock=sim.clock))
+    elif output == "null":
+        sim.sink = NullSink()
+    else:
+        # Through the shared terminal writer, which counts what is rendered
+        sim.sink = OUTPUT_SINKS[output](sim.terminal)
+    sim.setup_logging(args.log_file, int(args.log_budget * 1024 * 1024), args.log_compress)
+    if args.journal:
+        sim.journal = EventJournal(args.journal, args.journal_fsync)
+    if args.record:
+        sim.recorder = SessionRecorder(args.record, sim.clock)
+    sim.perf = PerfStats(max(0, args.perf_rss_every))
+    sim.perf_report = args.perf
+    sim.perf_json = args.perf_json
+    if args.profile:
+        sim.profiler = ActivityProfiler(args.profile, args.profile_out)
+        sim.profiler.start()
+    if args.trace:
+        sim.start_trace(args.trace)
+    if args.metrics_port is not None:
+        try:
+            sim.serve_metrics(args.metrics_port)
+        except OSError as e:
+            parser.error(f"--metrics-port {args.metrics_port}: {e.strerror or e}")
     
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    if hasattr(signal, 'SIGWINCH'):
+        signal.signal(signal.SIGWINCH, sim.geometry.on_resize)
+    
+    if args.monitoring:
+        sim.start_monitors()
+    
+    if args.processes > 0:
+        loop = sim.clock.new_event_loop()
+        try:
+            loop.run_until_complete(sim.run_async(args.duration, args.processes))
+        finally:
+            loop.close()
+            sim.close_trace()
+        return
     
     try:
         # Boot sequence
         sim.boot_sequence()
         
-        if args.dashboard:
-            # Live dashboard mode
-            with Live(sim.create_dashboard(), refresh_per_second=1) as live:
-                start_time = time.time()
+        if args.dashboard and sim.sink.animated:
+            # Live dashboard mode; it redraws when lines stream past it
+            dashboard = Live(sim.create_dashboard(), console=sim.console, auto_refresh=False)
+            with sim.live_region(dashboard, refresh_per_second=1) as live:
+                start_time = sim.clock.time()
                 while sim.running:
-                    sim.main_consciousness_loop()
-                    live.update(sim.create_dashboard())
+                    sim.main_consciousness_loop(args.duration)
+                    live.update(sim.create_dashboard(), refresh=True)
                     
-                    if args.duration > 0 and time.time() - start_time > args.duration:
+                    if args.duration > 0 and sim.clock.time() - start_time > args.duration:
                         break
         else:
-            # Regular simulation mode
-            if args.duration > 0:
-                # Run for specified duration
-                start_time = time.time()
-                while sim.running and time.time() - start_time < args.duration:
-                    sim.main_consciousness_loop()
-            else:
-                # Run indefinitely
-                sim.main_consciousness_loop()
+            # Regular simulation mode (duration 0 runs indefinitely)
+            sim.main_consciousness_loop(args.duration)
                 
+    except KeyboardInterrupt:
+        pass  # Interrupted by a signal; shut down below
     except Exception as e:
         sim.log(f"Fatal error: {e}", sim.current_theme['critical'], 
                prefix="fatal", priority=Priority.CRITICAL)
     finally:
         sim.shutdown_sequence()
+        sim.close_trace()
 
 if __name__ == "__main__":
     main()